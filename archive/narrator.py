@@ -1,8 +1,12 @@
 # Archived due to cost concerns with frequent OpenAI calls, lack of substantial data, and limited scope.
 
-import yfinance as yf
 import os
-import openai
+import sys
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from dotenv import load_dotenv
 from core.database import SheilaVault
 
@@ -10,13 +14,28 @@ load_dotenv()
 
 # CONFIGURATION
 VOLATILITY_THRESHOLD = 0.00 # 3% move triggers an explanation | To test use 0.00% -- Forces AI to explain every stock movement
-client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+Z_SCORE_THRESHOLD = 2.0     # With --zscore: flag moves this many standard deviations from normal
+VOL_LOOKBACK_DAYS = 60      # Calendar days of history behind the "normal" volatility
+NARRATOR_WORKERS = 8        # News/OpenAI calls in flight at once
+
+_client = None
+_client_lock = threading.Lock()
+
+def _get_client():
+    """The OpenAI client, built on first use (a quiet day never pays for importing openai)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            import openai
+            _client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    return _client
 
 def get_market_news(ticker):
     """
     Fetches the top 3 headlines for a specific ticker using yfinance.
     """
     try:
+        import yfinance as yf
         stock = yf.Ticker(ticker)
         news_items = stock.news
         
@@ -56,7 +75,7 @@ def generate_explanation(ticker, pct_change, headlines):
     """
 
     try:
-        response = client.chat.completions.create(
+        response = _get_client().chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "You are a financial news analyst."},
@@ -68,7 +87,52 @@ def generate_explanation(ticker, pct_change, headlines):
     except Exception as e:
         return "Analysis unavailable."
 
-def run_narrator():
+def screen_moves(closes, threshold=VOLATILITY_THRESHOLD, z_threshold=None):
+    """
+    One vectorized pass over a date x symbol close matrix.
+    Each symbol's move is its latest close vs. its own previous close.
+    With z_threshold, a move is flagged when it is that many standard deviations
+    away from the symbol's recent daily moves (so a 3% day in a bond fund stands
+    out, and in a crypto coin it doesn't). Otherwise the fixed threshold applies.
+    Returns the flagged symbols as a DataFrame (move, volatility, z_score), biggest move first.
+    """
+    import numpy as np
+    import pandas as pd
+    if closes.empty:
+        return pd.DataFrame(columns=['move', 'volatility', 'z_score'])
+    valid = closes.notna()
+    # Returns from each symbol's own previous close (crypto trades on days stocks don't)
+    returns = closes.ffill().pct_change(fill_method=None).where(valid)
+
+    has_return = returns.notna()
+    last_row = len(returns) - 1 - has_return.to_numpy()[::-1].argmax(axis=0)
+    move = returns.ffill().iloc[-1]
+
+    # Volatility of everything BEFORE the latest move
+    is_latest = np.arange(len(returns))[:, None] == last_row[None, :]
+    volatility = returns.mask(is_latest).std()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_score = move / volatility
+
+    screen = pd.DataFrame({'move': move, 'volatility': volatility, 'z_score': z_score})
+    screen = screen[has_return.any()]
+    if z_threshold is not None:
+        flagged = screen[screen['z_score'].abs() >= z_threshold]
+    else:
+        flagged = screen[screen['move'].abs() >= threshold]
+    return flagged.reindex(flagged['move'].abs().sort_values(ascending=False).index)
+
+def _brief(ticker, pct_change):
+    """Runs on a worker thread: news + explanation for one mover."""
+    headlines = get_market_news(ticker)
+    explanation = generate_explanation(ticker, pct_change, headlines) if headlines else None
+    return headlines, explanation
+
+def run_narrator(z_threshold=None):
+    # numpy/pandas come in with the price store, so `fina narrate --help` doesn't pay for them
+    from core.price_store import PriceStore
+    from spokes.harvest_engine import quote_symbol
     print("\n<<< THE ALPHA NARRATOR >>>\n")
     print("---> Scanning portfolio for volatility...")
     
@@ -81,76 +145,62 @@ def run_narrator():
     active_tickers = list(set([h[0] for h in holdings if h[0]]))
     
     # Map crypto if needed (Reusing logic from Tax Scout)
-    TICKER_MAP = {'BTC': 'BTC-USD', 'ETH': 'ETH-USD', 'LTC': 'LTC-USD'}
+    search_tickers = [quote_symbol(t) for t in active_tickers if t != "UNKNOWN"]
     
-    search_tickers = [TICKER_MAP.get(t, t) for t in active_tickers if t != "UNKNOWN"]
-    
-    print(f"---> Checking {len(search_tickers)} assets for major moves (> {VOLATILITY_THRESHOLD*100}%)...")
+    if z_threshold is not None:
+        print(f"---> Checking {len(search_tickers)} assets for unusual moves (|z| >= {z_threshold} vs. the last {VOL_LOOKBACK_DAYS} days)...")
+    else:
+        print(f"---> Checking {len(search_tickers)} assets for major moves (> {VOLATILITY_THRESHOLD*100}%)...")
 
-    # 2. Bulk Download Prices (Efficiency)
+    # 2. Prices from the local store (it only downloads the days it is missing)
+    store = PriceStore(vault)
     try:
-        data = yf.download(search_tickers, period="1d", progress=False)['Close']
-        # Calculate daily return: (Current - Open) / Open
-        # Note: yf.download(period='1d') gives minute data usually, or just open/close.
-        # Better approach for volatility: Get 2 days of history to compare Close vs Close
-        data_hist = yf.download(search_tickers, period="5d", progress=False)['Close']
+        # Only the window the screen reads - the store's default would pull years of bars per holding
+        store.update(search_tickers, lookback_days=VOL_LOOKBACK_DAYS)
+        closes = store.closes(search_tickers, start=(date.today() - timedelta(days=VOL_LOOKBACK_DAYS)).isoformat())
     except Exception as e:
         print(f"[X] Data Fetch Error: {e}")
         return
 
-    # 3. Analyze Each Ticker
-    for ticker in search_tickers:
-        try:
-            # Handle Single Ticker vs Multi-Ticker DataFrames
-            if len(search_tickers) == 1:
-                history = data_hist # It's already a Series
-            else:
-                if ticker not in data_hist: continue
-                history = data_hist[ticker]
-            
-            # Drop NaNs and get last 2 days
-            history = history.dropna()
-            if len(history) < 2: continue
-            
-            prev_close = history.iloc[-2]
-            current_price = history.iloc[-1]
-            
-            pct_change = (current_price - prev_close) / prev_close
-            
-            # 4. The Trigger
-            if abs(pct_change) >= VOLATILITY_THRESHOLD:
-                print(f"\n⚡ VOLATILITY DETECTED: {ticker} is {pct_change*100:.2f}%")
-                
-                # Fetch News
-                print(f"   Reading the news for {ticker}...")
-                headlines = get_market_news(ticker)
-
-                # --- NEW DEBUG LINE ---
-                print(f"   [DEBUG] Headlines Found:\n{headlines}") 
-                # ----------------------
-                
-                if not headlines:
-                    print(f"   (No recent news found for {ticker})")
-                    continue
-                    
-                # Ask AI
-                explanation = generate_explanation(ticker, pct_change, headlines)
-                print(f"   S.H.E.I.L.A.: \"{explanation}\"")
-                
-                # Log it
-                vault.log_action("NARRATOR", "EXPLAINED_MOVE", f"{ticker}: {explanation}")
-
-            else:
-                # Optional: Comment out to reduce noise
-                # print(f"   {ticker} is stable ({pct_change*100:.2f}%).")
-                pass
-
-        except Exception as e:
-            # print(f"   [!] Error analyzing {ticker}: {e}")
-            continue
-
-    print("\n---> Briefing Complete.")
+    # 3. The Trigger: one pass over the whole portfolio
+    movers = screen_moves(closes, VOLATILITY_THRESHOLD, z_threshold)
+    if movers.empty:
+        print("\n---> Nothing moved enough to explain.")
+        vault.close()
+        return
+
+    # 4. News + AI for every mover at once (bounded, so we stay polite to Yahoo/OpenAI)
+    print(f"---> {len(movers)} mover(s). Reading the news...")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=NARRATOR_WORKERS) as pool:
+        briefs = pool.map(_brief, movers.index, movers['move'])
+
+        for (ticker, row), (headlines, explanation) in zip(movers.iterrows(), briefs):
+            print(f"\n⚡ VOLATILITY DETECTED: {ticker} is {row['move']*100:.2f}% (z {row['z_score']:+.1f})")
+
+            # --- NEW DEBUG LINE ---
+            print(f"   [DEBUG] Headlines Found:\n{headlines}") 
+            # ----------------------
+
+            if not headlines:
+                print(f"   (No recent news found for {ticker})")
+                continue
+
+            print(f"   S.H.E.I.L.A.: \"{explanation}\"")
+
+            # Log it
+            vault.log_action("NARRATOR", "EXPLAINED_MOVE", f"{ticker}: {explanation}")
+
+    print(f"\n---> Briefing Complete ({len(movers)} mover(s) in {time.perf_counter() - start:.1f}s).")
     vault.close()
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="The Alpha Narrator - explains big moves in your portfolio.")
+    parser.add_argument("--zscore", nargs="?", type=float, const=Z_SCORE_THRESHOLD, metavar="Z",
+                        help=f"Flag moves by z-score of recent volatility (default {Z_SCORE_THRESHOLD}) instead of the fixed threshold")
+    args = parser.parse_args(argv)
+    run_narrator(args.zscore)
+    return 0
+
 if __name__ == "__main__":
-    run_narrator()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
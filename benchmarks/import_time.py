@@ -0,0 +1,91 @@
+"""
+Start-up cost of the fina CLI and every subcommand module.
+
+Imports each module in a fresh interpreter under `python -X importtime`
+and checks the cumulative time against a budget. Also fails if a module
+pulls in one of the LAZY packages at import - those belong inside the
+functions that use them. Exits 1 when anything is over, so it can gate CI.
+
+Run: python -m benchmarks.import_time
+"""
+
+import os
+import subprocess
+import sys
+from fina import COMMANDS
+
+# --- CONFIGURATION ---
+RUNS = 3                   # Best of N fresh interpreters (the first run also writes .pyc files)
+DEFAULT_BUDGET_MS = 150    # Plain stdlib + SQLite + rich territory
+BUDGET_MS = {
+    'fina': 15,
+    'spokes.simulator': 300,          # numpy
+}
+LAZY = ('openai', 'yfinance', 'plaid')   # Never imported just by loading a module
+TOP_PACKAGES = 3                          # Heaviest third-party packages listed per module
+# ---------------------
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _import_profile(module):
+    """Returns (cumulative ms for the module, {top-level package: self ms}) from one fresh interpreter."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop('OPENAI_API_KEY', None) # Importing must not depend on having keys
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    # Children are printed before their parent, so the module's own subtree is every
+    # line since the previous top-level import (interpreter start-up comes before it)
+    subtree, total = [], None
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if name.startswith("  "): # Indented = imported by something else
+            subtree.append((name.strip(), int(self_us)))
+        elif name.strip() == module:
+            total = int(cumulative_us) / 1000
+            break
+        else:
+            subtree = []
+
+    packages = {}
+    for name, self_us in subtree:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0.0) + self_us / 1000
+    return total, packages
+
+def run_benchmark():
+    modules = ['fina'] + [module for module, _ in COMMANDS.values()]
+    print(f"\nS.H.E.I.L.A. | Import Time Benchmark (best of {RUNS}, python -X importtime)")
+    print(f"   {'module':<22} {'ms':>8} {'budget':>8}  heaviest")
+    failures = []
+    for module in modules:
+        profiles = [_import_profile(module) for _ in range(RUNS)]
+        total, packages = min(profiles, key=lambda p: p[0])
+        budget = BUDGET_MS.get(module, DEFAULT_BUDGET_MS)
+        ours = {'core', 'spokes', 'archive'}
+        third_party = [p for p in packages if p not in ours and p not in sys.stdlib_module_names and not p.startswith("_")]
+        heaviest = sorted(third_party, key=packages.get, reverse=True)[:TOP_PACKAGES]
+        eager = [p for p in LAZY if p in packages]
+
+        status = "ok"
+        if total > budget:
+            status = "OVER BUDGET"
+            failures.append(module)
+        if eager:
+            status = f"imports {', '.join(eager)}"
+            failures.append(module)
+        print(f"   {module:<22} {total:>8.1f} {budget:>8}  "
+              f"{', '.join(f'{p} {packages[p]:.0f}' for p in heaviest) or '-'}  [{status}]")
+
+    if failures:
+        print(f"\n   {len(failures)} check(s) failed.")
+        return 1
+    print("\n   All modules within budget.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run_benchmark())
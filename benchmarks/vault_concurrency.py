@@ -0,0 +1,94 @@
+"""
+Concurrent read/write latency benchmark for SheilaVault.
+
+Simulates tax_scout-style readers hammering the holdings table while a sync
+keeps writing new snapshots. Uses a throwaway database and key, so your
+real vault (and config/secret.key) is never touched.
+
+Run: python -m benchmarks.vault_concurrency
+"""
+
+import os
+import statistics
+import tempfile
+import threading
+import time
+from core.database import SheilaVault
+
+# --- CONFIGURATION ---
+READERS = 4          # Concurrent reader threads
+DURATION = 5.0       # Seconds to run
+POSITIONS = 500      # Positions per account snapshot
+ACCOUNTS = 5
+# ---------------------
+
+def _percentiles(samples):
+    """Returns (p50, p95, max) in milliseconds."""
+    if not samples:
+        return 0.0, 0.0, 0.0
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return statistics.median(ordered) * 1000, p95 * 1000, ordered[-1] * 1000
+
+def _snapshot(tick):
+    """A fake holdings snapshot like a daily sync: every price moves, and a handful of positions trade."""
+    return [
+        (f"T{i}", 10.0 + (tick if i % 50 == 0 else 0), 1000.0, 100.0 + tick * 0.01, "USD", f"sec_{i}")
+        for i in range(POSITIONS)
+    ]
+
+def run_benchmark():
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = SheilaVault(db_path=os.path.join(tmp, "bench.db"), key_path=os.path.join(tmp, "bench.key"))
+        for a in range(ACCOUNTS):
+            vault.replace_holdings(f"acc_{a}", _snapshot(0))
+
+        stop = threading.Event()
+        read_latency, write_latency = [], []
+        errors = []
+
+        def reader():
+            samples = []
+            try:
+                while not stop.is_set():
+                    start = time.perf_counter()
+                    vault.cursor.execute("SELECT ticker, quantity, cost_basis FROM holdings")
+                    vault.cursor.fetchall()
+                    samples.append(time.perf_counter() - start)
+            except Exception as e:
+                errors.append(e)
+            read_latency.extend(samples)
+
+        def writer():
+            tick = 0
+            try:
+                while not stop.is_set():
+                    tick += 1
+                    start = time.perf_counter()
+                    vault.replace_holdings(f"acc_{tick % ACCOUNTS}", _snapshot(tick))
+                    write_latency.append(time.perf_counter() - start)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=reader) for _ in range(READERS)]
+        threads.append(threading.Thread(target=writer))
+        for t in threads:
+            t.start()
+        time.sleep(DURATION)
+        stop.set()
+        for t in threads:
+            t.join()
+
+        journal = vault.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        vault.close()
+
+    print(f"\nS.H.E.I.L.A. | Vault Concurrency Benchmark (journal_mode={journal}, {READERS} readers + 1 writer, {DURATION:.0f}s)")
+    print(f"   {'':<8} {'ops':>8} {'ops/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for label, samples in (("reads", read_latency), ("writes", write_latency)):
+        p50, p95, worst = _percentiles(samples)
+        print(f"   {label:<8} {len(samples):>8} {len(samples) / DURATION:>9.0f} {p50:>9.2f} {p95:>9.2f} {worst:>9.2f}")
+    if errors:
+        print(f"   {len(errors)} error(s), first: {errors[0]}")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,119 @@
+"""
+The Scribe: a buffered writer for S.H.E.I.L.A.'s audit trail (system_logs).
+
+Spokes call SheilaVault.log_action() from hot loops. Instead of one INSERT +
+commit (= one fsync) per line, entries are queued and a background thread
+writes them in batches - whenever BATCH_SIZE entries are waiting or
+FLUSH_SECONDS have passed, whichever comes first.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime
+
+# --- CONFIGURATION ---
+BATCH_SIZE = 100       # Write as soon as this many entries are waiting
+FLUSH_SECONDS = 1.0    # ...or after this long, whichever comes first
+MAX_PENDING = 10000    # Entries beyond this are dropped (and counted) instead of blocking the caller
+# ---------------------
+
+_STOP = object()
+
+class AuditWriter:
+    """
+    Background batch writer for system_logs.
+    Guarantees a final flush on close() and at interpreter exit.
+    """
+
+    def __init__(self, vault, batch_size=BATCH_SIZE, flush_seconds=FLUSH_SECONDS, max_pending=MAX_PENDING):
+        self.vault = vault
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="sheila-audit", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def pending(self):
+        """Entries queued but not yet written."""
+        return self._queue.qsize()
+
+    def stats(self):
+        return {'pending': self.pending, 'written': self.written, 'dropped': self.dropped}
+
+    def log(self, spoke, action, details):
+        """Queues one audit entry. Never blocks - if the buffer is full the entry is counted as dropped."""
+        if self._closed:
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait((datetime.now(), spoke, action, details))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Blocks until everything queued before this call is on disk."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        """Flushes whatever is left and stops the background thread. Safe to call twice."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    # --- Background thread ---
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_seconds
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._write(batch)
+                return
+            if isinstance(item, threading.Event): # flush() request
+                self._write(batch)
+                batch = []
+                item.set()
+                continue
+            if item is not None:
+                batch.append(item)
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_seconds
+
+    def _write(self, batch):
+        """One transaction per batch (runs on this thread's own vault connection)."""
+        if not batch:
+            return
+        try:
+            with self.vault.conn:
+                self.vault.conn.executemany('''
+                    INSERT INTO system_logs (timestamp, spoke_name, action, details)
+                    VALUES (?, ?, ?, ?)
+                ''', batch)
+            self.written += len(batch)
+        except Exception as e:
+            self.dropped += len(batch)
+            print(f"S.H.E.I.L.A. | Audit log write failed, {len(batch)} entries lost: {e}")
@@ -7,12 +7,79 @@ The Interaction: Provides Python methods for S.H.E.I.L.A. to save/read data.
 import sqlite3
 import os
 import json
+import hashlib
+import threading
+import weakref
 from datetime import datetime
 from cryptography.fernet import Fernet
+from core.audit_log import AuditWriter
 
 # CONSTANTS
 DB_PATH = 'data/fina_os.db'
 KEY_PATH = 'config/secret.key'
+BUSY_TIMEOUT_MS = 5000   # How long a connection waits on a lock before giving up
+CACHE_SIZE_KB = 20000    # Page cache per connection (~20 MB)
+
+class _RowCounter:
+    """Wraps an iterable of rows and counts them as executemany() consumes it."""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = next(self._rows)
+        self.count += 1
+        return row
+
+class _ThreadConnection:
+    """
+    One thread's connection + cursor. It lives in a threading.local, which Python
+    drops when the thread exits - the finalizer set in SheilaVault.conn then closes
+    the connection, so short-lived threads (one per Flask request) don't leak it.
+    """
+    __slots__ = ('conn', 'cursor', '__weakref__')
+
+def _release(connections, lock, conn):
+    """Closes a connection whose thread has ended (or whose vault was closed)."""
+    with lock:
+        connections.discard(conn)
+    conn.close()
+
+def _position_key(row):
+    """
+    What makes a (ticker, qty, basis, price, currency, security_id) row the same position:
+    the security (or ticker), quantity, cost basis and currency. The price is left out -
+    Plaid's close moves every trading day, and a new price isn't a new position.
+    """
+    ticker, quantity, cost_basis, _, currency, security_id = row
+    return (security_id or ticker, quantity, cost_basis, currency)
+
+def _diff_rows(existing, new_rows):
+    """
+    Matches stored (id, *values) rows with the incoming value tuples by _position_key.
+    Returns (ids that are no longer present, value tuples that need inserting,
+    [(id, stored values, new values)] for positions that are still there).
+    Duplicates are handled as a multiset, so two identical lots stay two rows.
+    """
+    unmatched = {}
+    for row_id, *values in existing:
+        unmatched.setdefault(_position_key(values), []).append((row_id, tuple(values)))
+
+    to_insert, kept = [], []
+    for row in new_rows:
+        candidates = unmatched.get(_position_key(row))
+        if candidates:
+            row_id, values = candidates.pop() # Same position as last time
+            kept.append((row_id, values, row))
+        else:
+            to_insert.append(row)
+
+    stale_ids = [row_id for candidates in unmatched.values() for row_id, _ in candidates]
+    return stale_ids, to_insert, kept
 
 class SheilaVault:
     """
@@ -20,30 +87,73 @@ class SheilaVault:
     Functions as the 'Memory' for S.H.E.I.L.A.
     """
     
-    def __init__(self):
+    def __init__(self, db_path=DB_PATH, key_path=KEY_PATH):
+        self.db_path = db_path
+        self.key_path = key_path
         self._ensure_paths()                     # 1. Ensure necessary folders exist
         self.cipher = self._load_or_create_key() # 2. Load or create encryption key
-        # Allow multi-threaded access            # 3. Connect to the database
-        self.conn = sqlite3.connect(DB_PATH, check_same_thread=False) 
-        self.cursor = self.conn.cursor()         # 4. Initialize the database schema if it doesn't exist
-        self._initialize_schema()                # 5. Create tables for accounts, holdings, transactions, and logs
+        # One connection per thread              # 3. Connections are opened lazily by the 'conn' property
+        self._local = threading.local()
+        self._connections = set()
+        self._connections_lock = threading.RLock() # RLock: a finalizer may fire while close() holds it
+        self._audit = None                       # Background audit writer, started on first log_action()
+        self._initialize_schema()                # 4. Create tables for accounts, holdings, transactions, and logs
+
+    # --- Connection handling ---
+    # sqlite3 connections and cursors must not be shared between threads mid-query.
+    # Every thread (e.g. each Flask request thread) gets its own connection, and WAL
+    # mode lets readers like tax_scout keep reading while a sync is writing.
+
+    def _thread_connection(self):
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            holder = _ThreadConnection()
+            holder.conn = self._connect()
+            holder.cursor = holder.conn.cursor()
+            # Closed as soon as this thread is gone (the holder dies with its thread-local)
+            weakref.finalize(holder, _release, self._connections, self._connections_lock, holder.conn)
+            self._local.holder = holder
+        return holder
+
+    @property
+    def conn(self):
+        """The calling thread's connection (opened on first use, closed when the thread exits)."""
+        return self._thread_connection().conn
+
+    @property
+    def cursor(self):
+        """The calling thread's cursor. Safe to use as 'vault.cursor.execute(...)' from any thread."""
+        return self._thread_connection().cursor
+
+    def _connect(self):
+        """Opens a tuned connection and remembers it so close() can shut it down."""
+        # check_same_thread=False only so close() and the thread-exit finalizer can close it from elsewhere
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")            # Readers don't block the writer (and vice versa)
+        conn.execute("PRAGMA synchronous=NORMAL")          # Safe with WAL, far fewer fsyncs than FULL
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        with self._connections_lock:
+            self._connections.add(conn)
+        return conn
 
     def _ensure_paths(self):
         """Creates necessary folders if they don't exist."""
-        os.makedirs('data', exist_ok=True)
-        os.makedirs('config', exist_ok=True)
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        os.makedirs(os.path.dirname(self.key_path) or '.', exist_ok=True)
 
     def _load_or_create_key(self):
         """
         Loads the encryption key. If one doesn't exist, it creates it.
         WARNING: If you lose 'secret.key', your encrypted data is unreadable.
         """
-        if os.path.exists(KEY_PATH):
-            with open(KEY_PATH, 'rb') as key_file:
+        if os.path.exists(self.key_path):
+            with open(self.key_path, 'rb') as key_file:
                 key = key_file.read()
         else:
             key = Fernet.generate_key()
-            with open(KEY_PATH, 'wb') as key_file:
+            with open(self.key_path, 'wb') as key_file:
                 key_file.write(key)
         return Fernet(key)
 
@@ -57,7 +167,57 @@ class SheilaVault:
         if text is None: return None
         return self.cipher.decrypt(text.encode()).decode()
 
+    # --- Schema Migrations ---
+    # The database remembers its schema version in PRAGMA user_version.
+    # On startup we run every migration newer than that, each in its own
+    # transaction, so old databases upgrade in place (no more nuke.py).
+    # RULE: never edit a migration that has shipped - append a new one.
+
+    def _migrations(self):
+        """Ordered list of migrations. Migration N upgrades user_version N-1 -> N."""
+        return [
+            self._migration_1_base_tables,
+            self._migration_2_query_indexes,
+            self._migration_3_quote_cache,
+            self._migration_4_securities,
+            self._migration_5_proxy_cache,
+            self._migration_6_investment_transactions,
+            self._migration_7_price_bars,
+            self._migration_8_price_coverage,
+        ]
+
     def _initialize_schema(self):
+        """
+        Brings the memory structure for S.H.E.I.L.A. up to the latest version.
+        Safe when several processes start at once (say the setup server and a sync):
+        each migration takes the write lock first and re-reads the version under it,
+        so one another process already applied is skipped instead of run twice.
+        """
+        migrations = self._migrations()
+        is_new = not self.conn.execute("SELECT 1 FROM sqlite_master").fetchone()
+
+        while self.conn.execute("PRAGMA user_version").fetchone()[0] < len(migrations): # Cheap check, no lock
+            # IMMEDIATE: take the write lock now, so nobody else migrates between our read and our write.
+            # DDL is transactional in SQLite - a failed step leaves no trace.
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                current = self.conn.execute("PRAGMA user_version").fetchone()[0]
+                if current >= len(migrations): # Another process finished the job while we waited
+                    self.conn.rollback()
+                    break
+                migration = migrations[current]
+                migration()
+                self.conn.execute(f"PRAGMA user_version = {current + 1}")
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            if not is_new:
+                print(f"S.H.E.I.L.A. Memory upgraded to schema v{current + 1} ({migration.__name__})")
+
+        print(f"S.H.E.I.L.A. Memory initialized at {self.db_path}")
+
+    def _migration_1_base_tables(self):
         """Defines the memory structure for S.H.E.I.L.A."""
         
         # Table 1: Accounts (Linked Brokerages/Banks)
@@ -112,8 +272,150 @@ class SheilaVault:
             )
         ''')
 
-        self.conn.commit()
-        print(f"S.H.E.I.L.A. Memory initialized at {DB_PATH}")
+        # Table 5: Sync Cursors (One per Plaid item, for incremental /transactions/sync)
+        # Keyed by a hash of the access token so the token itself never sits here in plain text.
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sync_cursors (
+                item_key TEXT PRIMARY KEY,
+                cursor TEXT,
+                updated_at TIMESTAMP
+            )
+        ''')
+
+        # Table 6: Holding Snapshots (One row per account per sync)
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS holding_snapshots (
+                snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                account_id TEXT,
+                taken_at TIMESTAMP,
+                opened INTEGER DEFAULT 0,
+                closed INTEGER DEFAULT 0,
+                FOREIGN KEY(account_id) REFERENCES accounts(account_id)
+            )
+        ''')
+
+        # Table 7: Holdings History (Deltas between snapshots)
+        # A position version lives from 'valid_from' until the snapshot that changed it ('valid_to').
+        # Unchanged positions are never rewritten, so keeping history stays cheap.
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS holdings_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                account_id TEXT,
+                ticker TEXT,
+                quantity REAL,
+                cost_basis REAL,
+                current_price REAL,
+                currency TEXT,
+                valid_from INTEGER,
+                valid_to INTEGER,
+                FOREIGN KEY(valid_from) REFERENCES holding_snapshots(snapshot_id)
+            )
+        ''')
+
+    def _migration_2_query_indexes(self):
+        """Secondary indexes so the common lookups stop being full table scans."""
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_holdings_account ON holdings(account_id)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_holdings_ticker ON holdings(ticker)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_transactions_account_date ON transactions(account_id, date)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_system_logs_time_spoke ON system_logs(timestamp, spoke_name)")
+        # Used by replace_holdings() to find the open versions of an account
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_holdings_history_open ON holdings_history(account_id, valid_to)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_holding_snapshots_account ON holding_snapshots(account_id)")
+
+    def _migration_3_quote_cache(self):
+        """Table 8: Quote Cache (Last known market price per symbol, for tax_scout)."""
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS quote_cache (
+                symbol TEXT PRIMARY KEY,
+                price REAL,
+                fetched_at REAL
+            )
+        ''') # fetched_at is a Unix timestamp so TTL checks are simple arithmetic
+
+    def _migration_4_securities(self):
+        """Table 9: Securities (Plaid's metadata per security), referenced by holdings."""
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS securities (
+                security_id TEXT PRIMARY KEY,
+                ticker TEXT,
+                name TEXT,
+                type TEXT,
+                cusip TEXT,
+                isin TEXT,
+                close_price REAL,
+                close_price_as_of TEXT,
+                currency TEXT,
+                updated_at TIMESTAMP
+            )
+        ''')
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_securities_ticker ON securities(ticker)")
+        self.cursor.execute("ALTER TABLE holdings ADD COLUMN security_id TEXT REFERENCES securities(security_id)")
+        self.cursor.execute("ALTER TABLE holdings_history ADD COLUMN security_id TEXT")
+
+    def _migration_5_proxy_cache(self):
+        """Table 10: Proxy Cache (proxy_finder answers, so we don't pay OpenAI twice)."""
+        # prompt_hash covers the model + prompt wording: change either and old answers stop matching.
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS proxy_cache (
+                ticker TEXT,
+                prompt_hash TEXT,
+                response TEXT,
+                latency REAL,
+                created_at REAL,
+                hits INTEGER DEFAULT 0,
+                PRIMARY KEY (ticker, prompt_hash)
+            )
+        ''')
+
+    def _migration_6_investment_transactions(self):
+        """Table 11: Investment Transactions (buys/sells per security, for the wash-sale check)."""
+        # Plaid convention: quantity > 0 for buys, < 0 for sells.
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS investment_transactions (
+                investment_transaction_id TEXT PRIMARY KEY,
+                account_id TEXT,
+                security_id TEXT,
+                ticker TEXT,
+                date TEXT,
+                type TEXT,
+                subtype TEXT,
+                quantity REAL,
+                price REAL,
+                amount REAL,
+                fees REAL,
+                currency TEXT,
+                FOREIGN KEY(account_id) REFERENCES accounts(account_id)
+            )
+        ''')
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_investment_transactions_ticker_date ON investment_transactions(ticker, date)")
+
+    def _migration_7_price_bars(self):
+        """Table 12: Price Bars (daily OHLC history, read through core/price_store.py)."""
+        # WITHOUT ROWID clusters rows by (symbol, date): one symbol's history sits
+        # together on disk, so a range read is a single sequential scan.
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS price_bars (
+                symbol TEXT,
+                date TEXT,
+                open REAL,
+                high REAL,
+                low REAL,
+                close REAL,
+                adj_close REAL,
+                volume REAL,
+                updated_at REAL,
+                PRIMARY KEY (symbol, date)
+            ) WITHOUT ROWID
+        ''')
+
+    def _migration_8_price_coverage(self):
+        """Table 13: Price Coverage (how far back each symbol's history has been requested)."""
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS price_coverage (
+                symbol TEXT PRIMARY KEY,
+                requested_from TEXT
+            )
+        ''')
 
     # --- These are input methods (Writing to Memory) ---
 
@@ -134,58 +436,232 @@ class SheilaVault:
         self.conn.commit() # Changes aren't saved to a db unil commit() them.
 
     def log_action(self, spoke, action, details):
-        """Logs a system event for liability tracking."""
-        self.cursor.execute('''
-            INSERT INTO system_logs (timestamp, spoke_name, action, details)
-            VALUES (?, ?, ?, ?)
-        ''', (datetime.now(), spoke, action, details))
-        self.conn.commit()
+        """
+        Logs a system event for liability tracking.
+        Entries are buffered and written in batches on a background thread;
+        call flush_logs() if you need them on disk right now.
+        """
+        with self._connections_lock:
+            if self._audit is None:
+                self._audit = AuditWriter(self)
+        self._audit.log(spoke, action, details)
+
+    def flush_logs(self):
+        """Blocks until every buffered audit entry has been written."""
+        if self._audit:
+            self._audit.flush()
+
+    def audit_stats(self):
+        """Counters for the audit buffer: {'pending', 'written', 'dropped'}."""
+        if self._audit is None:
+            return {'pending': 0, 'written': 0, 'dropped': 0}
+        return self._audit.stats()
 
     def get_all_accounts(self): # Returns a list of all linked accounts so we can loop through them
         self.cursor.execute("SELECT account_id, name_encrypted, access_token_encrypted FROM accounts")
         return self.cursor.fetchall()
 
-    def add_transaction(self, t): # Saves a single transaction to memory.
+    def _transaction_row(self, t):
+        """Flattens a Plaid transaction into the column order of the transactions table."""
         # Plaid categories are lists (e.g., ['Food', 'Restaurants']). We join them into a string.
         category = ", ".join(t.category) if t.category else "Uncategorized"
-        
-        sql = '''INSERT OR REPLACE INTO transactions 
-                 (transaction_id, account_id, merchant_name, amount, date, category)
-                 VALUES (?, ?, ?, ?, ?, ?)'''
-        
-        self.cursor.execute(sql, (
+        return (
             t.transaction_id,
             t.account_id,
             t.name, # Merchant Name
             t.amount,
             t.date,
             category
-        ))
-        self.conn.commit()
+        )
 
-    def add_holding(self, account_id, ticker, qty, basis, price, currency):
-        """Saves a snapshot of an investment holding."""
-        sql = '''INSERT INTO holdings 
-                 (account_id, ticker, quantity, cost_basis, current_price, currency)
+    def add_transaction(self, t): # Saves a single transaction to memory.
+        sql = '''INSERT OR REPLACE INTO transactions 
+                 (transaction_id, account_id, merchant_name, amount, date, category)
                  VALUES (?, ?, ?, ?, ?, ?)'''
         
-        self.cursor.execute(sql, (
-            account_id,
-            ticker,
-            qty,
-            basis,
-            price,
-            currency
-        ))
+        self.cursor.execute(sql, self._transaction_row(t))
         self.conn.commit()
 
+    def add_transactions(self, transactions):
+        """
+        Bulk version of add_transaction. Accepts any iterable (lists or generators)
+        and writes everything inside ONE transaction, so we pay a single commit
+        instead of one fsync per row. Returns the number of rows written.
+        """
+        sql = '''INSERT OR REPLACE INTO transactions 
+                 (transaction_id, account_id, merchant_name, amount, date, category)
+                 VALUES (?, ?, ?, ?, ?, ?)'''
+
+        counter = _RowCounter(self._transaction_row(t) for t in transactions)
+        with self.conn: # Commits on success, rolls back if anything fails mid-batch
+            self.conn.executemany(sql, counter)
+        return counter.count
+
+    def apply_transaction_deltas(self, access_token, added, modified, removed_ids, next_cursor):
+        """
+        Applies one /transactions/sync result (or one page of it): upserts added +
+        modified rows, deletes removed ones (e.g. pending -> posted) and advances the
+        item's cursor. Pass next_cursor=None for every page but the last, so the cursor
+        only moves once the whole sync is saved. Each call is ONE transaction; if an
+        earlier page failed, the caller must not apply the last one (sync_data drops the
+        rest of that sync), or the cursor would move past changes we never saved.
+        Returns (upserted, deleted).
+        """
+        sql = '''INSERT OR REPLACE INTO transactions 
+                 (transaction_id, account_id, merchant_name, amount, date, category)
+                 VALUES (?, ?, ?, ?, ?, ?)'''
+
+        upserts = _RowCounter(self._transaction_row(t) for t in (*added, *modified))
+        with self.conn:
+            self.conn.executemany(sql, upserts)
+            deleted = self.conn.executemany(
+                "DELETE FROM transactions WHERE transaction_id = ?",
+                ((tid,) for tid in removed_ids)
+            ).rowcount
+            if next_cursor is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sync_cursors (item_key, cursor, updated_at) VALUES (?, ?, ?)",
+                    (self._item_key(access_token), next_cursor, datetime.now())
+                )
+        return upserts.count, max(deleted, 0)
+
+    def replace_holdings(self, account_id, rows):
+        """
+        Records a new holdings snapshot for one account.
+        'rows' is any iterable of (ticker, qty, basis, price, currency, security_id) tuples.
+
+        Only the difference against the previous snapshot is written: a position
+        is the same security, quantity, cost basis and currency as last time, and
+        a kept position just has its price updated in place. Sold/changed ones are
+        closed off in 'holdings_history' and new ones are opened - a price move
+        alone never makes a new version (a version keeps the price it opened at;
+        the daily close lives in 'securities'). The 'holdings' table always holds
+        the latest snapshot, and all of it happens in ONE transaction, so readers
+        (like tax_scout) never see a half-written portfolio.
+        Returns the number of positions in the snapshot.
+        """
+        new_rows = [tuple(row) for row in rows]
+
+        with self.conn:
+            snapshot_id = self.conn.execute(
+                "INSERT INTO holding_snapshots (account_id, taken_at) VALUES (?, ?)",
+                (account_id, datetime.now())
+            ).lastrowid
+
+            # 1. The latest view
+            current = self.conn.execute('''
+                SELECT id, ticker, quantity, cost_basis, current_price, currency, security_id
+                FROM holdings WHERE account_id = ?
+            ''', (account_id,))
+            stale_ids, fresh_rows, kept = _diff_rows(current, new_rows)
+            self.conn.executemany("DELETE FROM holdings WHERE id = ?", ((i,) for i in stale_ids))
+            self.conn.executemany(
+                "UPDATE holdings SET ticker = ?, current_price = ? WHERE id = ?",
+                ((new[0], new[3], row_id) for row_id, old, new in kept if old != new)
+            )
+            self.conn.executemany('''
+                INSERT INTO holdings (account_id, ticker, quantity, cost_basis, current_price, currency, security_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', ((account_id, *row) for row in fresh_rows))
+
+            # 2. The history (each version is valid from one snapshot until the position changes)
+            open_versions = self.conn.execute('''
+                SELECT id, ticker, quantity, cost_basis, current_price, currency, security_id
+                FROM holdings_history WHERE account_id = ? AND valid_to IS NULL
+            ''', (account_id,))
+            closed_ids, opened_rows, _ = _diff_rows(open_versions, new_rows)
+            self.conn.executemany(
+                "UPDATE holdings_history SET valid_to = ? WHERE id = ?",
+                ((snapshot_id, i) for i in closed_ids)
+            )
+            self.conn.executemany('''
+                INSERT INTO holdings_history
+                    (account_id, ticker, quantity, cost_basis, current_price, currency, security_id, valid_from)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', ((account_id, *row, snapshot_id) for row in opened_rows))
+
+            self.conn.execute(
+                "UPDATE holding_snapshots SET opened = ?, closed = ? WHERE snapshot_id = ?",
+                (len(opened_rows), len(closed_ids), snapshot_id)
+            )
+        return len(new_rows)
+
+    def upsert_securities(self, securities):
+        """
+        Saves Plaid 'Security' objects (ticker, type, CUSIP/ISIN, last close) in one transaction.
+        Returns the number of securities written.
+        """
+        now = datetime.now()
+        counter = _RowCounter(
+            (
+                s.security_id,
+                s.ticker_symbol,
+                s.name,
+                s.type,
+                s.cusip,
+                s.isin,
+                s.close_price,
+                str(s.close_price_as_of) if s.close_price_as_of else None,
+                s.iso_currency_code,
+                now
+            )
+            for s in securities
+        )
+        with self.conn:
+            self.conn.executemany('''
+                INSERT OR REPLACE INTO securities
+                    (security_id, ticker, name, type, cusip, isin, close_price, close_price_as_of, currency, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', counter)
+        return counter.count
+
+    def add_investment_transactions(self, transactions, securities=()):
+        """
+        Saves Plaid 'InvestmentTransaction' objects in one transaction (re-syncing is safe).
+        'securities' maps each row to its ticker; falls back to the securities table.
+        Returns the number of rows written.
+        """
+        tickers = {s.security_id: s.ticker_symbol for s in securities}
+        missing = {t.security_id for t in transactions if t.security_id and t.security_id not in tickers}
+        if missing:
+            placeholders = ",".join("?" * len(missing))
+            tickers.update(self.conn.execute(
+                f"SELECT security_id, ticker FROM securities WHERE security_id IN ({placeholders})",
+                list(missing)
+            ))
+
+        counter = _RowCounter(
+            (
+                t.investment_transaction_id,
+                t.account_id,
+                t.security_id,
+                tickers.get(t.security_id),
+                str(t.date),
+                str(t.type),
+                str(t.subtype),
+                t.quantity,
+                t.price,
+                t.amount,
+                t.fees,
+                t.iso_currency_code
+            )
+            for t in transactions
+        )
+        with self.conn:
+            self.conn.executemany('''
+                INSERT OR REPLACE INTO investment_transactions
+                    (investment_transaction_id, account_id, security_id, ticker, date, type, subtype,
+                     quantity, price, amount, fees, currency)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', counter)
+        return counter.count
+
     def clear_holdings(self, account_id):
         """
-        Holdings change daily. It's safer to wipe the old snapshot 
-        and replace it with the new one to avoid duplicates.
+        Records an empty snapshot for the account (e.g. everything was sold).
+        Goes through replace_holdings so the history stays intact.
         """
-        self.cursor.execute("DELETE FROM holdings WHERE account_id = ?", (account_id,))
-        self.conn.commit()
+        self.replace_holdings(account_id, [])
 
     # --- These are output methods (Reading from Memory) ---
 
@@ -197,8 +673,152 @@ class SheilaVault:
             return self._decrypt(result[0])
         return None
 
+    def get_latest_holdings(self, account_id=None):
+        """
+        Returns the latest snapshot as (account_id, ticker, quantity, cost_basis, current_price, currency, security_id)
+        rows - for one account, or every account if none is given.
+        """
+        sql = "SELECT account_id, ticker, quantity, cost_basis, current_price, currency, security_id FROM holdings"
+        if account_id is None:
+            self.cursor.execute(sql)
+        else:
+            self.cursor.execute(sql + " WHERE account_id = ?", (account_id,))
+        return self.cursor.fetchall()
+
+    def get_holding_closes(self):
+        """
+        Plaid's last close for every security we currently hold:
+        {ticker: (close_price, close_price_as_of 'YYYY-MM-DD' or None)}. Zero network.
+        """
+        rows = self.conn.execute('''
+            SELECT DISTINCT h.ticker, s.close_price, s.close_price_as_of
+            FROM holdings h
+            JOIN securities s ON s.security_id = h.security_id
+            WHERE s.close_price IS NOT NULL
+            ORDER BY s.close_price_as_of
+        ''')
+        # Ordered oldest -> newest, so the freshest close wins if a ticker appears twice
+        return {ticker: (price, as_of) for ticker, price, as_of in rows}
+
+    def get_trades(self, since=None):
+        """
+        Every buy and sell across all accounts, oldest first:
+        (ticker, date 'YYYY-MM-DD', quantity, price, account_id) rows, with quantity
+        signed by type (buys > 0, sells < 0). 'since' ('YYYY-MM-DD') limits how far back to look.
+        """
+        sql = '''
+            SELECT ticker, date,
+                   CASE WHEN type = 'sell' THEN -ABS(quantity) ELSE ABS(quantity) END,
+                   ABS(price), account_id
+            FROM investment_transactions
+            WHERE type IN ('buy', 'sell') AND ticker IS NOT NULL AND date >= ?
+            ORDER BY ticker, date
+        '''
+        return self.conn.execute(sql, (since or "",)).fetchall()
+
+    def get_holdings_snapshot(self, snapshot_id):
+        """Rebuilds an older snapshot from the history table. Same row shape as get_latest_holdings()."""
+        self.cursor.execute('''
+            SELECT h.account_id, h.ticker, h.quantity, h.cost_basis, h.current_price, h.currency, h.security_id
+            FROM holding_snapshots s
+            JOIN holdings_history h ON h.account_id = s.account_id
+            WHERE s.snapshot_id = ?
+              AND h.valid_from <= s.snapshot_id
+              AND (h.valid_to IS NULL OR h.valid_to > s.snapshot_id)
+        ''', (snapshot_id,))
+        return self.cursor.fetchall()
+
+    def get_snapshot_ids(self, account_id):
+        """Lists (snapshot_id, taken_at, opened, closed) for an account, oldest first."""
+        self.cursor.execute(
+            "SELECT snapshot_id, taken_at, opened, closed FROM holding_snapshots WHERE account_id = ? ORDER BY snapshot_id",
+            (account_id,)
+        )
+        return self.cursor.fetchall()
+
+    def get_cached_quotes(self, symbols):
+        """Returns {symbol: (price, fetched_at)} for every symbol we have a cached quote for."""
+        symbols = list(symbols)
+        quotes = {}
+        # Chunked to stay under SQLite's bound-parameter limit
+        for i in range(0, len(symbols), 500):
+            chunk = symbols[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT symbol, price, fetched_at FROM quote_cache WHERE symbol IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            quotes.update({symbol: (price, fetched_at) for symbol, price, fetched_at in rows})
+        return quotes
+
+    def save_quotes(self, prices, fetched_at=None):
+        """Writes {symbol: price} into the quote cache in one transaction."""
+        fetched_at = fetched_at if fetched_at is not None else datetime.now().timestamp()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO quote_cache (symbol, price, fetched_at) VALUES (?, ?, ?)",
+                ((symbol, float(price), fetched_at) for symbol, price in prices.items())
+            )
+
+    def get_cached_proxy(self, ticker, prompt_hash, max_age):
+        """
+        Returns (response, latency) for a cached proxy answer younger than 'max_age' seconds,
+        or None. A hit is counted so we can report the latency it saved.
+        """
+        row = self.conn.execute(
+            "SELECT response, latency, created_at FROM proxy_cache WHERE ticker = ? AND prompt_hash = ?",
+            (ticker, prompt_hash)
+        ).fetchone()
+        if not row or datetime.now().timestamp() - row[2] > max_age:
+            return None
+        with self.conn:
+            self.conn.execute(
+                "UPDATE proxy_cache SET hits = hits + 1 WHERE ticker = ? AND prompt_hash = ?",
+                (ticker, prompt_hash)
+            )
+        return row[0], row[1]
+
+    def save_proxy(self, ticker, prompt_hash, response, latency):
+        """Writes a fresh proxy answer through to the cache."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO proxy_cache (ticker, prompt_hash, response, latency, created_at, hits) VALUES (?, ?, ?, ?, ?, 0)",
+                (ticker, prompt_hash, response, latency, datetime.now().timestamp())
+            )
+
+    def invalidate_proxy_cache(self, ticker=None):
+        """Drops cached proxy answers for one ticker (or all of them). Returns how many were removed."""
+        with self.conn:
+            if ticker is None:
+                return self.conn.execute("DELETE FROM proxy_cache").rowcount
+            return self.conn.execute("DELETE FROM proxy_cache WHERE ticker = ?", (ticker,)).rowcount
+
+    def proxy_cache_stats(self):
+        """Lifetime cache numbers: {'entries', 'hits', 'seconds_saved'}."""
+        entries, hits, saved = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(hits), 0), COALESCE(SUM(hits * latency), 0) FROM proxy_cache"
+        ).fetchone()
+        return {'entries': entries, 'hits': hits, 'seconds_saved': saved}
+
+    def _item_key(self, access_token):
+        """Stable, non-reversible key for a Plaid item (one access token = one item)."""
+        return hashlib.sha256(access_token.encode()).hexdigest()
+
+    def get_sync_cursor(self, access_token):
+        """Returns the last /transactions/sync cursor for this item, or None before the first backfill."""
+        self.cursor.execute("SELECT cursor FROM sync_cursors WHERE item_key = ?", (self._item_key(access_token),))
+        result = self.cursor.fetchone()
+        return result[0] if result else None
+
     def close(self):
-        self.conn.close()
+        """Flushes the audit log, then closes every connection this vault still has open, on any thread."""
+        if self._audit:
+            self._audit.close()
+            self._audit = None
+        with self._connections_lock:
+            for conn in list(self._connections):
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
 
 # Quick Test to ensure it works
 if __name__ == "__main__":
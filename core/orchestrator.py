@@ -1,14 +1,127 @@
 from core.database import SheilaVault
 from core.plaid_client import SheilaConnector
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import queue
+import sys
+import threading
 import time
 
-def sync_data(): # Think of this as the "Morning Snapshot" of all the records for you to use in the daily analysis.
+# --- CONFIGURATION ---
+SYNC_WORKERS = 4  # How many Plaid items (bank logins) are fetched at the same time (1 = one after another)
+PUT_TIMEOUT = 0.5 # Seconds a worker waits on a full queue before checking whether the writer is still there
+# ---------------------
+
+class _WriterGone(Exception):
+    """The writer stopped draining the queue (Ctrl-C or an error), so workers give up."""
+
+def _put(writes, stop, message):
+    """Hands a result to the writer, without ever blocking forever on a queue nobody drains."""
+    while not stop.is_set():
+        try:
+            writes.put(message, timeout=PUT_TIMEOUT)
+            return
+        except queue.Full:
+            pass
+    raise _WriterGone()
+
+def _rate(rows, start):
+    """Formats the write throughput since 'start' (a time.perf_counter() value)."""
+    elapsed = time.perf_counter() - start
+    return f"{rows / elapsed:,.0f} rows/sec" if elapsed > 0 else "n/a rows/sec"
+
+def _fetch_item(connector, item, access_token, writes, stop, abandoned, incremental=True, cursor=None, days_back=30):
+    """
+    Runs on a worker thread. Makes ONE set of Plaid calls for the whole item
+    (every account behind this access token) and hands each result to the
+    'writes' queue so the single writer is the only one touching SQLite.
+    'stop' is set when the writer quits; the worker then bails out instead of waiting.
+    'abandoned' is set when the writer failed to save one of this item's sync pages;
+    the rest of the pages are then pointless (the cursor won't be saved), so we stop paging.
+    """
+    start = time.perf_counter()
+    error = None
+    try:
+        # --- STEP A: SYNC TRANSACTIONS (For Sentinel) ---
+        # Each Plaid transaction already carries its own account_id, so the item-wide
+        # result lands on the right account without any extra calls.
+        # Page by page either way, so a multi-year backfill never sits in memory all at once
+        if incremental:
+            # Only the changes since our last cursor (the very first run is the full backfill).
+            # The cursor rides along with the last page only, so it's saved once everything else is.
+            for page in connector.iter_sync_pages(access_token, cursor):
+                if abandoned.is_set():
+                    break
+                if page is None:
+                    _put(writes, stop, ("note", item, "Plaid data changed mid-sync; re-reading from the saved cursor"))
+                    continue
+                added, modified, removed, next_cursor, has_more = page
+                _put(writes, stop, ("deltas", item, (access_token, added, modified, removed, None if has_more else next_cursor)))
+        else:
+            for page, total in connector.iter_transaction_pages(access_token, days_back):
+                _put(writes, stop, ("transactions", item, (page, total)))
+
+        # --- STEP B: SYNC HOLDINGS (For Tax Scout) ---
+        # Note: Investments endpoints only work on Investment accounts.
+        # We wrap this in a try/except so checking accounts don't crash it.
+        investments = True
+        try:
+            holdings, securities = connector.get_holdings(access_token)
+
+            # Plaid separates 'Holdings' (Counts) from 'Securities' (Tickers).
+            # We map them together here, then fan the rows out by account_id.
+            sec_map = {s.security_id: s for s in securities}
+            rows_by_account = {}
+            for h in holdings:
+                sec = sec_map.get(h.security_id)
+                ticker = sec.ticker_symbol if sec else "UNKNOWN"
+                price = sec.close_price if sec else 0.0
+                rows_by_account.setdefault(h.account_id, []).append(
+                    (ticker, h.quantity, h.cost_basis, price, h.iso_currency_code, h.security_id)
+                )
+            _put(writes, stop, ("holdings", item, (securities, rows_by_account)))
+
+        except _WriterGone:
+            raise
+        except Exception as e:
+            # If it's just a checking account, Plaid will complain about "Investments". Ignore it.
+            if "PRODUCTS_NOT_SUPPORTED" in str(e):
+                investments = False
+                _put(writes, stop, ("note", item, "(Skipping Investments - Not an investment account)"))
+            else:
+                _put(writes, stop, ("note", item, f"Investment Sync Warning: {e}"))
+
+        # --- STEP C: SYNC TRADES (For the wash-sale check) ---
+        # Its own try, so a holdings hiccup doesn't cost us the trades (and vice versa)
+        if investments:
+            try:
+                trades, trade_securities = connector.get_investment_transactions(access_token)
+                _put(writes, stop, ("trades", item, (trade_securities, trades)))
+
+            except _WriterGone:
+                raise
+            except Exception as e:
+                _put(writes, stop, ("note", item, f"Investment Transactions Warning: {e}"))
+
+    except _WriterGone:
+        return
+    except Exception as e:
+        error = e
+
+    try:
+        _put(writes, stop, ("done", item, (time.perf_counter() - start, error)))
+    except _WriterGone:
+        pass
+
+def sync_data(workers=SYNC_WORKERS, incremental=True, days_back=30): # Think of this as the "Morning Snapshot" of all the records for you to use in the daily analysis.
     """
     The Routine:
     1. Wake up S.H.E.I.L.A. (Load DB and API Client)
-    2. Check all accounts.
-    3. Download latest transactions and holdings.
-    4. Save to Memory.
+    2. Check all accounts, grouped by Plaid item (one access token = one bank login).
+    3. Download latest transactions and holdings once per item ('workers' items at a time).
+       'incremental' pulls only the changes since the last run via /transactions/sync;
+       turn it off to re-download the last 'days_back' days instead (e.g. for a backfill).
+    4. Save to Memory (one writer, so SQLite is never hit concurrently).
     """
     print("S.H.E.I.L.A. | System Startup...")
     vault = SheilaVault()
@@ -20,64 +133,125 @@ def sync_data(): # Think of this as the "Morning Snapshot" of all the records fo
         print("No accounts found. Run 'setup_server.py' first.")
         return
 
-    print(f"S.H.E.I.L.A. | Found {len(accounts)} linked account(s). Starting sync...")
-
+    # Several accounts usually share one access token. Plaid returns the whole
+    # item's data on every call, so we only ask once per token.
+    tokens = {} # access_token -> item number
+    items = []  # item number -> {'token': access_token, 'accounts': {account_id: name}}
     for acc in accounts:
-        account_id = acc[0]
-        # Decrypt the name for display (acc[1] is name_encrypted)
-        account_name = vault._decrypt(acc[1])
         # Decrypt the token for Plaid (acc[2] is access_token_encrypted)
         access_token = vault._decrypt(acc[2])
+        if access_token not in tokens:
+            tokens[access_token] = len(items)
+            items.append({'token': access_token, 'accounts': {}})
+        # Decrypt the name for display (acc[1] is name_encrypted)
+        items[tokens[access_token]]['accounts'][acc[0]] = vault._decrypt(acc[1])
 
-        print(f"\n   Syncing: {account_name}...")
+    print(f"S.H.E.I.L.A. | Found {len(accounts)} linked account(s) across {len(items)} item(s). Starting sync with {workers} worker(s)...")
 
-        try:
-            # --- STEP A: SYNC TRANSACTIONS (For Sentinel) ---
-            transactions = connector.get_transactions(access_token)
-            print(f"      Found {len(transactions)} recent transactions.")
-            for t in transactions:
-                vault.add_transaction(t)
-
-            # --- STEP B: SYNC HOLDINGS (For Tax Scout) ---
-            # Note: Investments endpoints only work on Investment accounts.
-            # We wrap this in a try/except so checking accounts don't crash it.
+    names = {}
+    timings = {} # item -> {'fetch': seconds, 'write': seconds, 'rows': saved, 'expected': total, 'status': text}
+    # Bounded, so fast fetchers wait for the writer instead of piling pages up in memory
+    writes = queue.Queue(maxsize=max(1, workers) * 4)
+    stop = threading.Event()
+    abandoned = {} # item -> Event, set once one of its sync pages failed to save
+    run_start = time.perf_counter()
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        for item, info in enumerate(items):
+            names[item] = ", ".join(info['accounts'].values())
+            cursor = vault.get_sync_cursor(info['token']) if incremental else None
+            timings[item] = {'fetch': 0.0, 'write': 0.0, 'rows': 0, 'expected': None, 'status': "OK"}
+            abandoned[item] = threading.Event()
+            pool.submit(_fetch_item, connector, item, info['token'], writes, stop, abandoned[item], incremental, cursor, days_back)
+
+        # 2. The Writer: drain results as they arrive until every item reports 'done'
+        pending = len(items)
+        while pending:
+            kind, item, payload = writes.get()
+            name = names[item]
+            timing = timings[item]
+
+            if kind == "done":
+                pending -= 1
+                timing['fetch'], error = payload
+                if error:
+                    timing['status'] = "FAILED"
+                    print(f"   Failed to sync {name}: {error}")
+                elif timing['expected'] is not None:
+                    print(f"   {name}: Saved {timing['rows']} of {timing['expected']} transactions.")
+                    if timing['rows'] != timing['expected']:
+                        timing['status'] = "INCOMPLETE"
+                continue
+
+            if kind == "note":
+                print(f"   {name}: {payload}")
+                continue
+
+            # A lost sync page can't be re-fetched once the cursor moves past it, so after
+            # one fails nothing else from that sync is applied and its cursor is never saved.
+            # The next run starts again from the last cursor that did get saved.
+            if kind == "deltas" and abandoned[item].is_set():
+                continue
+
+            start = time.perf_counter()
             try:
-                holdings, securities = connector.get_holdings(access_token)
-                
-                # Wipe old data for this account before adding new
-                vault.clear_holdings(account_id)
-                
-                # Plaid separates 'Holdings' (Counts) from 'Securities' (Tickers).
-                # We map them together here.
-                sec_map = {s.security_id: s for s in securities}
-                
-                for h in holdings:
-                    sec = sec_map.get(h.security_id)
-                    ticker = sec.ticker_symbol if sec else "UNKNOWN"
-                    price = sec.close_price if sec else 0.0
-                    
-                    vault.add_holding(
-                        account_id=account_id,
-                        ticker=ticker,
-                        qty=h.quantity,
-                        basis=h.cost_basis,
-                        price=price,
-                        currency=h.iso_currency_code
-                    )
-                print(f"      Saved {len(holdings)} investment positions.")
-                
+                if kind == "deltas":
+                    upserted, deleted = vault.apply_transaction_deltas(*payload)
+                    print(f"   {name}: Applied {upserted} new/changed and {deleted} removed transactions ({_rate(upserted + deleted, start)}).")
+                elif kind == "transactions":
+                    page, timing['expected'] = payload
+                    saved = vault.add_transactions(page)
+                    timing['rows'] += saved
+                    print(f"   {name}: Saved page of {saved} transactions ({_rate(saved, start)}).")
+                elif kind == "holdings":
+                    securities, rows_by_account = payload
+                    # Securities first, so the holdings can point at them
+                    vault.upsert_securities(securities)
+                    # Every linked account gets a fresh snapshot (an empty one if it holds nothing).
+                    # Old snapshot is swapped for the new one in a single transaction.
+                    saved = 0
+                    for account_id in set(items[item]['accounts']) | set(rows_by_account):
+                        saved += vault.replace_holdings(account_id, rows_by_account.get(account_id, []))
+                    print(f"   {name}: Saved {saved} investment positions and {len(securities)} securities ({_rate(saved, start)}).")
+                elif kind == "trades":
+                    securities, trades = payload
+                    # Sold-out positions still show up here, so their securities may be new to us
+                    vault.upsert_securities(securities)
+                    saved = vault.add_investment_transactions(trades, securities)
+                    print(f"   {name}: Saved {saved} investment transactions ({_rate(saved, start)}).")
             except Exception as e:
-                # If it's just a checking account, Plaid will complain about "Investments". Ignore it.
-                if "PRODUCTS_NOT_SUPPORTED" in str(e):
-                    print("      (Skipping Investments - Not an investment account)")
-                else:
-                    print(f"      Investment Sync Warning: {e}")
+                timing['status'] = "FAILED"
+                print(f"   Failed to save {name}: {e}")
+                if kind == "deltas":
+                    abandoned[item].set()
+                    print(f"   {name}: Dropping the rest of this sync; it will be retried from the saved cursor next run.")
+            timing['write'] += time.perf_counter() - start
 
-        except Exception as e:
-            print(f"   Failed to sync {account_name}: {e}")
+    finally:
+        # However the writer exits (Ctrl-C included), tell the workers to stop instead of
+        # leaving them blocked on a full queue, and drop items that haven't started yet.
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    # 3. The Report
+    print("\nS.H.E.I.L.A. | Sync Summary")
+    print(f"   {'Item':<30} {'Fetch':>8} {'Write':>8}  Status")
+    for item, timing in timings.items():
+        print(f"   {names[item][:30]:<30} {timing['fetch']:>7.2f}s {timing['write']:>7.2f}s  {timing['status']}")
+    print(f"   Total wall-clock: {time.perf_counter() - run_start:.2f}s")
 
     print("\nS.H.E.I.L.A. | Sync Complete. Memory updated.")
     vault.close()
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sync - pull the latest transactions and holdings from Plaid into the vault.")
+    parser.add_argument("--workers", type=int, default=SYNC_WORKERS, help="Plaid items fetched at the same time")
+    parser.add_argument("--full", action="store_true", help="Re-download the last --days-back days instead of only the changes")
+    parser.add_argument("--days-back", type=int, default=30, help="History re-downloaded by --full")
+    args = parser.parse_args(argv)
+    sync_data(args.workers, incremental=not args.full, days_back=args.days_back)
+    return 0
+
 if __name__ == "__main__":
-    sync_data()
\ No newline at end of file
+    sys.exit(main())
@@ -1,14 +1,4 @@
 import os
-import plaid
-from plaid.api import plaid_api
-from plaid.model.link_token_create_request import LinkTokenCreateRequest
-from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
-from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
-from plaid.model.transactions_get_request import TransactionsGetRequest
-from plaid.model.transactions_get_request_options import TransactionsGetRequestOptions
-from plaid.model.investments_holdings_get_request import InvestmentsHoldingsGetRequest
-from plaid.model.country_code import CountryCode
-from plaid.model.products import Products
 from dotenv import load_dotenv
 from datetime import date, timedelta
 
@@ -19,9 +9,14 @@ class SheilaConnector:
     """
     The 'Nerves' of the operation. 
     Handles all direct communication with the Plaid Financial API.
+    The Plaid SDK (and each request model) is imported where it's used,
+    so importing this module costs nothing until we actually talk to Plaid.
     """
 
     def __init__(self):
+        import plaid
+        from plaid.api import plaid_api
+
         # 1. Configure the Client
         configuration = plaid.Configuration(
             host=plaid.Environment.Sandbox, # Change to Development for real data once ready to leave "Sandbox"
@@ -40,6 +35,11 @@ class SheilaConnector:
         Generates a temporary token needed to open the Plaid 'Link' UI 
         so you can log in to your bank securely.
         """
+        from plaid.model.link_token_create_request import LinkTokenCreateRequest
+        from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
+        from plaid.model.country_code import CountryCode
+        from plaid.model.products import Products
+
         request = LinkTokenCreateRequest(
             products=[Products('transactions'), Products('investments')],
             client_name="Fina.os - S.H.E.I.L.A.",
@@ -57,6 +57,8 @@ class SheilaConnector:
         Exchanges the temporary 'public_token' (received after you log in)
         for a permanent 'access_token' (which we save in the database).
         """
+        from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
+
         request = ItemPublicTokenExchangeRequest(
             public_token=public_token
         )
@@ -68,31 +70,157 @@ class SheilaConnector:
     def get_transactions(self, access_token, days_back=30):
         """
         Fetches transaction history for the Sentinel Spoke.
+        Convenience wrapper that collects every page into one list - use
+        iter_transaction_pages() for long histories.
         """
+        transactions = []
+        for page, _ in self.iter_transaction_pages(access_token, days_back):
+            transactions.extend(page)
+        return transactions
+
+    def iter_transaction_pages(self, access_token, days_back=30, page_size=500):
+        """
+        Streams the transaction history one page at a time.
+        Yields (page, total_transactions) so callers can write each page as it
+        arrives and check the final row count, instead of holding years of rows in memory.
+        """
+        from plaid.model.transactions_get_request import TransactionsGetRequest
+        from plaid.model.transactions_get_request_options import TransactionsGetRequestOptions
+
         start_date = date.today() - timedelta(days=days_back)
         end_date = date.today()
-        
-        request = TransactionsGetRequest(
-            access_token=access_token,
-            start_date=start_date,
-            end_date=end_date,
-            options=TransactionsGetRequestOptions(
-                include_personal_finance_category=True # Getting that AI categorization
+        offset = 0
+
+        while True:
+            request = TransactionsGetRequest(
+                access_token=access_token,
+                start_date=start_date,
+                end_date=end_date,
+                options=TransactionsGetRequestOptions(
+                    include_personal_finance_category=True, # Getting that AI categorization
+                    count=page_size,
+                    offset=offset
+                )
             )
-        )
-        response = self.client.transactions_get(request)
-        return response['transactions']
+            response = self.client.transactions_get(request)
+            page = response['transactions']
+            total = response['total_transactions']
+            if not page:
+                return
+
+            yield page, total
+            offset += len(page)
+            if offset >= total:
+                return
+
+    def sync_transactions(self, access_token, cursor=None, page_size=500):
+        """
+        Incremental version of get_transactions built on /transactions/sync.
+        Only returns what changed since 'cursor' (None = first backfill).
+        Convenience wrapper that collects every page - use iter_sync_pages()
+        for a first backfill, which can be years of rows.
+        Returns (added, modified, removed_ids, next_cursor).
+        """
+        added, modified, removed = [], [], []
+        next_cursor = cursor
+        for page in self.iter_sync_pages(access_token, cursor, page_size):
+            if page is None: # Pagination restarted - drop what we collected
+                added, modified, removed = [], [], []
+                continue
+            page_added, page_modified, page_removed, next_cursor, _ = page
+            added.extend(page_added)
+            modified.extend(page_modified)
+            removed.extend(page_removed)
+        return added, modified, removed, next_cursor
+
+    def iter_sync_pages(self, access_token, cursor=None, page_size=500):
+        """
+        Streams /transactions/sync one page at a time.
+        Yields (added, modified, removed_ids, next_cursor, has_more) per page, so callers
+        can write each page as it arrives. Only the page with has_more=False carries
+        a cursor worth saving. If Plaid asks us to restart (the data changed while we
+        were paging), yields None and starts over from the original cursor - the pages
+        already written are simply upserted again.
+        """
+        import plaid
+        from plaid.model.transactions_sync_request import TransactionsSyncRequest
+        from plaid.model.transactions_sync_request_options import TransactionsSyncRequestOptions
+
+        while True:
+            next_cursor = cursor or ""
+            try:
+                has_more = True
+                while has_more:
+                    request = TransactionsSyncRequest(
+                        access_token=access_token,
+                        cursor=next_cursor,
+                        count=page_size,
+                        options=TransactionsSyncRequestOptions(
+                            include_personal_finance_category=True
+                        )
+                    )
+                    response = self.client.transactions_sync(request)
+                    next_cursor = response['next_cursor']
+                    has_more = response['has_more']
+                    yield (
+                        response['added'],
+                        response['modified'],
+                        [r['transaction_id'] for r in response['removed']],
+                        next_cursor,
+                        has_more
+                    )
+                return
+
+            except plaid.ApiException as e:
+                # Plaid asks us to restart the whole pagination loop from the
+                # original cursor if the data changed while we were paging.
+                if "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION" not in str(e.body):
+                    raise
+                yield None
 
     def get_holdings(self, access_token):
         """
         Fetches investment holdings for the Tax-Loss Scout.
         """
+        from plaid.model.investments_holdings_get_request import InvestmentsHoldingsGetRequest
+
         request = InvestmentsHoldingsGetRequest(
             access_token=access_token
         )
         response = self.client.investments_holdings_get(request)
         return response['holdings'], response['securities']
 
+    def get_investment_transactions(self, access_token, days_back=365, page_size=500):
+        """
+        Fetches buys/sells/dividends for the wash-sale check (a year covers the 61-day window with room to spare).
+        Returns (investment_transactions, securities).
+        """
+        from plaid.model.investments_transactions_get_request import InvestmentsTransactionsGetRequest
+        from plaid.model.investments_transactions_get_request_options import InvestmentsTransactionsGetRequestOptions
+
+        start_date = date.today() - timedelta(days=days_back)
+        end_date = date.today()
+        transactions, securities = [], {}
+        offset = 0
+
+        while True:
+            request = InvestmentsTransactionsGetRequest(
+                access_token=access_token,
+                start_date=start_date,
+                end_date=end_date,
+                options=InvestmentsTransactionsGetRequestOptions(
+                    count=page_size,
+                    offset=offset
+                )
+            )
+            response = self.client.investments_transactions_get(request)
+            page = response['investment_transactions']
+            transactions.extend(page)
+            securities.update((s.security_id, s) for s in response['securities'])
+            offset += len(page)
+            if not page or offset >= response['total_investment_transactions']:
+                return transactions, list(securities.values())
+
 # Quick Test (Only works if you have valid keys in .env)
 if __name__ == "__main__":
     try:
@@ -0,0 +1,199 @@
+"""
+The Ledger of Prices: daily OHLC history kept in the vault (price_bars table).
+
+Spokes ask the store for closes/returns instead of asking Yahoo. update()
+only downloads the days each symbol is missing since its last stored bar
+(plus any older stretch a longer lookback asks for), and range reads come
+back as one aligned date x symbol DataFrame (use .to_numpy() for a plain
+matrix).
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+import pandas as pd
+from core.database import SheilaVault
+
+# --- CONFIGURATION ---
+LOOKBACK_DAYS = 3 * 365     # History pulled the first time we see a symbol
+MAX_AGE_SECONDS = 15 * 60   # A symbol refreshed this recently is not downloaded again
+CHUNK_SIZE = 50             # Symbols per Yahoo request
+WORKERS = 4                 # Chunks downloaded at the same time
+# ---------------------
+
+FIELDS = ('open', 'high', 'low', 'close', 'adj_close', 'volume')
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+class PriceStore:
+    """
+    Incremental daily price history on top of SheilaVault.
+    Downloads run on worker threads; only the calling thread writes to SQLite.
+    """
+
+    def __init__(self, vault=None):
+        self._own_vault = vault is None
+        self.vault = vault or SheilaVault()
+
+    def close(self):
+        if self._own_vault:
+            self.vault.close()
+
+    # --- Bookkeeping ---
+
+    def coverage(self, symbols):
+        """
+        {symbol: (first bar, last bar, updated_at unix, requested_from)} for symbols we know.
+        requested_from is the earliest date we ever asked Yahoo for, so a symbol that
+        simply didn't trade back then isn't re-requested on every run.
+        """
+        symbols = list(symbols)
+        known = {}
+        for chunk in _chunks(symbols, 500): # SQLite's bound-parameter limit
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.vault.conn.execute(
+                f"SELECT symbol, MIN(date), MAX(date), MAX(updated_at) FROM price_bars WHERE symbol IN ({placeholders}) GROUP BY symbol",
+                chunk
+            )
+            known.update({symbol: (first, last, updated_at, None) for symbol, first, last, updated_at in rows})
+            rows = self.vault.conn.execute(
+                f"SELECT symbol, requested_from FROM price_coverage WHERE symbol IN ({placeholders})",
+                chunk
+            )
+            for symbol, requested_from in rows:
+                first, last, updated_at, _ = known.get(symbol, (None, None, None, None))
+                known[symbol] = (first, last, updated_at, requested_from)
+        return known
+
+    # --- Writing ---
+
+    def update(self, symbols, lookback_days=LOOKBACK_DAYS, max_age=MAX_AGE_SECONDS):
+        """
+        Brings every symbol up to date. Each download starts at the symbol's last
+        stored bar (re-fetched, since today's bar may have been partial), or
+        'lookback_days' ago for a new symbol. Asking for more history than we
+        have backfills just the missing older stretch.
+        Returns {'bars': rows written, 'downloaded': [symbols], 'fresh': [symbols], 'failed': [symbols]}.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        now = time.time()
+        known = self.coverage(symbols)
+        default_start = (date.today() - timedelta(days=lookback_days)).isoformat()
+
+        # Symbols that need the same date range share one request
+        by_range = {}
+        fresh = []
+        for symbol in symbols:
+            first, last, updated_at, requested_from = known.get(symbol, (None, None, None, None))
+            covered = [d for d in (first, requested_from) if d]
+            covered_from = min(covered) if covered else None
+            if covered_from and default_start < covered_from:
+                by_range.setdefault((default_start, covered_from), []).append(symbol) # Older history (end is exclusive)
+            if updated_at and now - updated_at < max_age:
+                fresh.append(symbol)
+            elif last or not covered_from:
+                by_range.setdefault((last or default_start, None), []).append(symbol)
+
+        report = {'bars': 0, 'downloaded': [], 'fresh': fresh, 'failed': []}
+        jobs = [(start, end, chunk) for (start, end), group in by_range.items() for chunk in _chunks(group, CHUNK_SIZE)]
+        if not jobs:
+            return report
+
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            futures = {pool.submit(self._download, chunk, start, end): (start, chunk) for start, end, chunk in jobs}
+            for future in as_completed(futures):
+                start, chunk = futures[future]
+                try:
+                    bars = future.result()
+                except Exception:
+                    report['failed'].extend(chunk)
+                    continue
+                report['bars'] += self._save(bars, now)
+                got = {bar[0] for bar in bars}
+                self._mark_requested([s for s in chunk if s in got or s in known], start)
+                report['downloaded'].extend(s for s in chunk if s in got and s not in report['downloaded'])
+                # No bars for a symbol we've never seen = unknown symbol (an empty backfill is normal)
+                report['failed'].extend(s for s in chunk if s not in got and s not in known)
+        return report
+
+    def _download(self, chunk, start, end=None):
+        """Runs on a worker thread. One batched yfinance call -> list of bar tuples."""
+        import yfinance as yf # Only when something is actually stale; reads never need it
+        data = yf.download(chunk, start=start, end=end, progress=False, auto_adjust=False, threads=False)
+        if data is None or data.empty:
+            return []
+        if not isinstance(data.columns, pd.MultiIndex): # Older yfinance: single ticker, flat columns
+            data = pd.concat({chunk[0]: data}, axis=1).swaplevel(axis=1)
+
+        bars = []
+        tickers = set(data.columns.get_level_values(1))
+        for symbol in chunk:
+            if symbol not in tickers:
+                continue
+            frame = data.xs(symbol, axis=1, level=1).dropna(subset=['Close'])
+            adj = frame['Adj Close'] if 'Adj Close' in frame else frame['Close']
+            for day, o, h, l, c, a, v in zip(frame.index, frame['Open'], frame['High'], frame['Low'],
+                                             frame['Close'], adj, frame['Volume']):
+                bars.append((symbol, day.strftime('%Y-%m-%d'), float(o), float(h), float(l), float(c), float(a), float(v)))
+        return bars
+
+    def _mark_requested(self, symbols, start):
+        """Remembers the earliest date each symbol has been requested from."""
+        with self.vault.conn:
+            self.vault.conn.executemany('''
+                INSERT INTO price_coverage (symbol, requested_from) VALUES (?, ?)
+                ON CONFLICT(symbol) DO UPDATE SET requested_from = MIN(requested_from, excluded.requested_from)
+            ''', ((symbol, start) for symbol in symbols))
+
+    def _save(self, bars, updated_at):
+        """Writes bars in one transaction (re-downloaded days simply replace the old row)."""
+        if not bars:
+            return 0
+        with self.vault.conn:
+            self.vault.conn.executemany('''
+                INSERT OR REPLACE INTO price_bars
+                    (symbol, date, open, high, low, close, adj_close, volume, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (bar + (updated_at,) for bar in bars))
+        return len(bars)
+
+    # --- Reading ---
+
+    def bars(self, symbols, start=None, end=None, field='adj_close'):
+        """
+        One field for many symbols as an aligned DataFrame: DatetimeIndex rows (oldest first),
+        one column per requested symbol (in the order given; all-NaN if we have no history).
+        start/end are inclusive 'YYYY-MM-DD' strings.
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Unknown price field '{field}'. Choose from {', '.join(FIELDS)}.")
+        symbols = list(dict.fromkeys(symbols))
+        rows = []
+        for chunk in _chunks(symbols, 500):
+            rows.extend(self.vault.conn.execute(
+                f'''SELECT symbol, date, {field} FROM price_bars
+                    WHERE symbol IN ({','.join('?' * len(chunk))}) AND date >= ? AND date <= ?''',
+                chunk + [start or "", end or "9999-12-31"]
+            ))
+
+        frame = pd.DataFrame(rows, columns=['symbol', 'date', field])
+        matrix = frame.pivot(index='date', columns='symbol', values=field)
+        matrix.index = pd.to_datetime(matrix.index)
+        matrix.columns.name = None
+        return matrix.sort_index().reindex(columns=symbols).astype(float)
+
+    def closes(self, symbols, start=None, end=None, adjusted=True):
+        """Daily closes (dividend/split adjusted by default), date x symbol."""
+        return self.bars(symbols, start, end, 'adj_close' if adjusted else 'close')
+
+    def returns(self, symbols, start=None, end=None, adjusted=True):
+        """
+        Daily simple returns, date x symbol. The first row of the range has no
+        base close, so it is dropped. Each return is measured from the symbol's own
+        previous close, so a stock's Monday isn't lost to crypto's weekend rows;
+        days a symbol didn't trade stay NaN (no fake 0% days).
+        """
+        closes = self.closes(symbols, start, end, adjusted)
+        return closes.ffill().pct_change(fill_method=None).where(closes.notna()).iloc[1:]
@@ -0,0 +1,53 @@
+"""
+fina: one entry point for every S.H.E.I.L.A. tool.
+
+Each subcommand is a module with a main(argv). The module is only imported
+once its subcommand is picked, and the modules themselves put off openai,
+yfinance, pandas and the Plaid SDK until they are needed - so `fina --help`,
+`fina scout --help` or a fully cached run start in a blink.
+
+Run: python fina.py scout --offline
+     python fina.py proxy VTI
+"""
+
+import argparse
+import importlib
+import sys
+
+# Subcommand -> (module, one-line help). Keep the modules out of the imports above.
+COMMANDS = {
+    'sync': ('core.orchestrator', "Pull the latest transactions and holdings from Plaid"),
+    'scout': ('spokes.tax_scout', "Find tax-loss harvesting opportunities"),
+    'architect': ('spokes.architect', "Design an investment blueprint"),
+    'proxy': ('spokes.proxy_finder', "Replacement ideas for a harvested position"),
+    'narrate': ('archive.narrator', "Explain today's big moves in your portfolio"),
+    'wash': ('spokes.wash_sale', "Check realized sales for wash-sale violations"),
+    'index': ('spokes.proxy_index', "Refresh the local correlation index of proxies"),
+    'simulate': ('spokes.simulator', "Monte Carlo projection of your blueprint"),
+    'backtest': ('spokes.backtester', "How your blueprint would have done historically"),
+}
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        prog="fina",
+        description="S.H.E.I.L.A. - your personal finance operating system.",
+        epilog="Run 'fina <command> --help' for a command's own options.",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="<command>")
+    for name, (_, summary) in COMMANDS.items():
+        commands.add_parser(name, help=summary, add_help=False)
+    return parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in COMMANDS:
+        parser = _parser()
+        parser.parse_args(argv) # Handles --help and unknown commands (exits)
+        parser.print_help()
+        return 1
+
+    module = importlib.import_module(COMMANDS[argv[0]][0])
+    return module.main(argv[1:]) or 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,10 @@ def nuke_it():
     if os.path.exists(DB_PATH):
         try:
             os.remove(DB_PATH)
+            # WAL mode keeps two sidecar files next to the database
+            for sidecar in (DB_PATH + "-wal", DB_PATH + "-shm"):
+                if os.path.exists(sidecar):
+                    os.remove(sidecar)
             print("✅ Database file successfully deleted.")
         except PermissionError:
             print("❌ ERROR: File is locked. Close any other Python terminals/DB browsers and try again.")
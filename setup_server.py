@@ -71,20 +71,22 @@ def exchange_public_token():
     access_token = sheila.exchange_public_token(public_token)
     
     # 2. Save to Encrypted Database
-    account_id = metadata['account_id']
     institution_name = metadata['institution']['name']
     
     # Note: Plaid Link returns one "main" account ID, but the access_token 
-    # usually gives access to all accounts at that bank.
-    vault.add_account(
-        account_id=account_id,
-        name=institution_name,
-        type="depository", # Defaulting for sandbox
-        subtype="checking",
-        access_token=access_token
-    )
+    # gives access to all accounts at that bank. We store every sub-account
+    # against the same token - sync groups them back into one Plaid call per item.
+    linked = metadata.get('accounts') or [{'id': metadata['account_id']}]
+    for acc in linked:
+        vault.add_account(
+            account_id=acc['id'],
+            name=f"{institution_name} - {acc['name']}" if acc.get('name') else institution_name,
+            type=acc.get('type') or "depository", # Defaulting for sandbox
+            subtype=acc.get('subtype') or "checking",
+            access_token=access_token
+        )
     
-    print(f"SUCCESSFULLY LINKED: {institution_name}")
+    print(f"SUCCESSFULLY LINKED: {institution_name} ({len(linked)} account(s))")
     return jsonify({'status': 'success'})
 
 if __name__ == '__main__':
@@ -0,0 +1,196 @@
+"""
+The Architect's offline brain: a rules-based allocation engine.
+
+The interview has a small, discrete answer space (goal, universe, risk
+reaction) plus age and horizon, so a glide path and a curated shelf of
+vehicles per asset class produce a sensible plan in well under a
+millisecond - same JSON shape as the LLM (archetype, rationale,
+allocation, blueprint), weights that always add up to 100%, and the same
+answer every time for the same profile.
+"""
+
+import copy
+import re
+from functools import lru_cache
+
+# --- CONFIGURATION ---
+MIN_EQUITY = 10          # Glide path floor (%)
+MAX_EQUITY = 95          # Glide path ceiling (%)
+SMALL_ACCOUNT = 1000     # Below this capital, keep to one vehicle per asset class
+# ---------------------
+
+# Answers exactly as run_architect() words them
+GOALS = ("Retirement", "House Downpayment", "Passive Income", "Aggressive Growth", "College Fund")
+UNIVERSES = (
+    "ETFs Only",
+    "ETFs and Mutual Funds",
+    "ETFs and High-Conviction Individual Stocks",
+    "ETFs, Bonds, CDs, and Treasuries",
+)
+RISK_LEVELS = ("Sell / Low Tolerance", "Hold / Medium Tolerance", "Buy More / High Tolerance")
+
+RISK_TILT = {RISK_LEVELS[0]: -15, RISK_LEVELS[1]: 0, RISK_LEVELS[2]: 10}    # Equity points added
+RISK_WORD = {RISK_LEVELS[0]: "Steady", RISK_LEVELS[1]: "Balanced", RISK_LEVELS[2]: "Bold"}
+GOAL_NOUN = {
+    "Retirement": "Glide Path",
+    "House Downpayment": "House Hunter",
+    "Passive Income": "Income Engine",
+    "Aggressive Growth": "Growth Compounder",
+    "College Fund": "Tuition Builder",
+}
+
+# The shelf: (ticker, name, reason). The first entry of each list is the core holding.
+EQUITY_CORE = {
+    "ETFs": ("SPLG", "SPDR Portfolio S&P 500 ETF", "Low-cost core of U.S. large caps."),
+    "Mutual Funds": ("VTSAX", "Vanguard Total Stock Market Index Fund", "The whole U.S. market in one fund."),
+}
+EQUITY_SATELLITES = {
+    "Retirement": [("VXUS", "Vanguard Total International Stock ETF", "Global diversification for the long haul."),
+                   ("VHT", "Vanguard Health Care ETF", "Defensive growth from an aging population.")],
+    "House Downpayment": [("VTV", "Vanguard Value ETF", "Steadier value stocks for a nearer finish line."),
+                          ("VHT", "Vanguard Health Care ETF", "Resilient sector with less cyclical swings.")],
+    "Passive Income": [("SCHD", "Schwab U.S. Dividend Equity ETF", "Quality dividend payers."),
+                       ("XLU", "Utilities Select Sector SPDR Fund", "Regulated, high-yield cash flows.")],
+    "Aggressive Growth": [("SOXX", "iShares Semiconductor ETF", "Picks and shovels of every tech cycle."),
+                          ("CIBR", "First Trust NASDAQ Cybersecurity ETF", "Structural spending growth in security."),
+                          ("XLY", "Consumer Discretionary Select Sector SPDR", "Rides consumer strength.")],
+    "College Fund": [("VXUS", "Vanguard Total International Stock ETF", "Broad global growth."),
+                     ("VTV", "Vanguard Value ETF", "Tempers volatility as tuition nears.")],
+}
+STOCK_PICKS = {
+    "Retirement": [("JNJ", "Johnson & Johnson", "Durable healthcare compounder."),
+                   ("JPM", "JPMorgan Chase", "Best-in-class bank franchise.")],
+    "House Downpayment": [("LOW", "Lowe's", "Tied to the housing theme you're saving for."),
+                          ("JPM", "JPMorgan Chase", "Benefits from a healthy mortgage market.")],
+    "Passive Income": [("O", "Realty Income", "Monthly dividend REIT."),
+                       ("PG", "Procter & Gamble", "Decades of dividend increases.")],
+    "Aggressive Growth": [("MSFT", "Microsoft", "Cloud and AI platform leader."),
+                          ("AVGO", "Broadcom", "Semiconductor and software cash machine.")],
+    "College Fund": [("COST", "Costco", "Steady, recession-resistant grower."),
+                     ("MSFT", "Microsoft", "High-quality growth anchor.")],
+}
+FIXED_INCOME = {
+    "core": ("BND", "Vanguard Total Bond Market ETF", "Broad, investment-grade ballast."),
+    "short": ("VGSH", "Vanguard Short-Term Treasury ETF", "Low-volatility Treasuries that won't drop much near the goal date."),
+    "income": ("VCIT", "Vanguard Intermediate-Term Corporate Bond ETF", "Higher coupons for income."),
+    "treasury": ("VGIT", "Vanguard Intermediate-Term Treasury ETF", "Government-backed, no credit risk."),
+    "cd": ("CD-LADDER", "Brokered CD Ladder", "FDIC-insured rungs maturing every year."),
+    "mutual": ("VBTLX", "Vanguard Total Bond Market Index Fund", "Broad bond exposure in fund form."),
+}
+REAL_ASSETS = {
+    "default": ("VNQ", "Vanguard Real Estate ETF", "Real estate as an inflation hedge."),
+    "income": ("O", "Realty Income", "Monthly dividend REIT."),
+    "growth": ("GLDM", "SPDR Gold MiniShares", "Uncorrelated crisis hedge."),
+}
+CASH = ("CASH", "High-Yield Savings / Money Market", "Liquidity and a buffer for emergencies.")
+
+def parse_capital(capital):
+    """'$5,000' / '5k' / 5000 -> 5000.0 (None if it can't be read)."""
+    if isinstance(capital, (int, float)):
+        return float(capital)
+    match = re.search(r"([\d,.]+)\s*([kKmM]?)", str(capital))
+    if not match:
+        return None
+    try:
+        amount = float(match.group(1).replace(",", ""))
+    except ValueError:
+        return None
+    return amount * {"k": 1e3, "m": 1e6}.get(match.group(2).lower(), 1)
+
+def _round_to_100(weights):
+    """Rounds {key: float %} to whole percents that still add up to exactly 100 (largest remainder)."""
+    floors = {k: int(w) for k, w in weights.items()}
+    leftover = 100 - sum(floors.values())
+    for k in sorted(weights, key=lambda k: weights[k] - floors[k], reverse=True)[:leftover]:
+        floors[k] += 1
+    return floors
+
+def asset_mix(age, goal, universe, risk, horizon):
+    """
+    The glide path: {'Equities', 'Fixed Income', 'Real Assets', 'Cash'} in whole percents.
+    Retirement/growth/income follow age; house and college follow the horizon.
+    """
+    if goal in ("House Downpayment", "College Fund"):
+        equity = 10 * horizon               # ~10% stocks per year until the money is needed
+    elif goal == "Aggressive Growth":
+        equity = 120 - age
+    elif goal == "Passive Income":
+        equity = 90 - age
+    else:
+        equity = 110 - age
+
+    equity += RISK_TILT[risk]
+    if universe == UNIVERSES[3]:            # Safety First
+        equity -= 15
+    if horizon <= 2:
+        equity = min(equity, 20)            # Money needed soon shouldn't ride the market
+    equity = max(MIN_EQUITY, min(MAX_EQUITY, equity))
+
+    cash = 20 if horizon <= 2 else 10 if horizon <= 5 and goal == "House Downpayment" else 5
+    real = 15 if goal == "Passive Income" else 5 if equity >= 40 else 0
+    equity = min(equity, 100 - real - cash)
+    fixed = 100 - equity - real - cash
+    return _round_to_100({'Equities': equity, 'Fixed Income': fixed, 'Real Assets': real, 'Cash': cash})
+
+def _vehicles(goal, universe, risk, horizon, small):
+    """Curated picks per asset class, each with its share (0-1) of that class."""
+    funds = "Mutual Funds" if universe == UNIVERSES[1] else "ETFs"
+    satellites = EQUITY_SATELLITES[goal][:1 if risk == RISK_LEVELS[0] else None]
+    equities = [(EQUITY_CORE[funds], 0.6)]
+    if universe == UNIVERSES[2]:
+        equities += [(pick, 0.2 / len(STOCK_PICKS[goal])) for pick in STOCK_PICKS[goal]]
+        equities += [(pick, 0.2 / len(satellites)) for pick in satellites]
+    else:
+        equities += [(pick, 0.4 / len(satellites)) for pick in satellites]
+
+    if universe == UNIVERSES[3]:
+        fixed = [(FIXED_INCOME["treasury"], 0.5), (FIXED_INCOME["cd"], 0.3), (FIXED_INCOME["short"], 0.2)]
+    elif horizon <= 5:
+        fixed = [(FIXED_INCOME["short"], 0.6), (FIXED_INCOME["core"], 0.4)]
+    elif goal == "Passive Income":
+        fixed = [(FIXED_INCOME["core"], 0.5), (FIXED_INCOME["income"], 0.5)]
+    else:
+        fixed = [(FIXED_INCOME["mutual" if funds == "Mutual Funds" else "core"], 1.0)]
+
+    real = [(REAL_ASSETS["income" if goal == "Passive Income" else "growth" if goal == "Aggressive Growth" else "default"], 1.0)]
+    plan = {'Equities': equities, 'Fixed Income': fixed, 'Real Assets': real, 'Cash': [(CASH, 1.0)]}
+    if small: # Fewer, bigger positions for small accounts
+        plan = {cls: [(picks[0][0], 1.0)] for cls, picks in plan.items()}
+    return plan
+
+@lru_cache(maxsize=256)
+def _build_plan(age, goal, universe, risk, horizon, small):
+    mix = asset_mix(age, goal, universe, risk, horizon)
+    vehicles = _vehicles(goal, universe, risk, horizon, small)
+
+    # Spread each class's weight over its vehicles, then round the whole plan to 100%
+    raw, info = {}, {}
+    for cls, picks in vehicles.items():
+        for (ticker, name, reason), share in picks:
+            if mix[cls]: # A ticker on two shelves (e.g. O) just gets both weights
+                raw[ticker] = raw.get(ticker, 0.0) + mix[cls] * share
+                info.setdefault(ticker, (name, reason))
+    weights = _round_to_100(raw)
+
+    tilt = {RISK_LEVELS[0]: "tilted toward safety", RISK_LEVELS[1]: "", RISK_LEVELS[2]: "tilted toward growth"}[risk]
+    return {
+        "archetype": f"The {RISK_WORD[risk]} {GOAL_NOUN[goal]}",
+        "rationale": (f"A {mix['Equities']}/{mix['Fixed Income']} stock/bond glide path for a "
+                      f"{horizon}-year {goal.lower()} plan at age {age}{', ' + tilt if tilt else ''}."),
+        "allocation": {cls: f"{pct}%" for cls, pct in mix.items()},
+        "blueprint": [
+            {"ticker": ticker, "name": info[ticker][0], "allocation": f"{pct}%", "reason": info[ticker][1]}
+            for ticker, pct in weights.items() if pct > 0
+        ],
+    }
+
+def build_plan(age, capital, goal, universe, risk, horizon):
+    """
+    The full plan for one interview. Memoized, so the same profile always gets
+    the same answer (and a repeat costs nothing). Returns a fresh copy each call.
+    """
+    if goal not in GOALS or universe not in UNIVERSES or risk not in RISK_LEVELS:
+        raise ValueError(f"Unknown profile answer: {goal!r} / {universe!r} / {risk!r}")
+    amount = parse_capital(capital)
+    small = amount is not None and amount < SMALL_ACCOUNT
+    return copy.deepcopy(_build_plan(int(age), goal, universe, risk, max(0, int(horizon)), small))
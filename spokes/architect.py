@@ -1,9 +1,11 @@
 import os
-import openai
+import time
+import argparse
 import json
 from dotenv import load_dotenv
 from datetime import datetime
-from rich.console import Console
+from rich.console import Console, Group
+from rich.live import Live
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
@@ -11,10 +13,19 @@ from rich.align import Align
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.prompt import Prompt, IntPrompt
 from rich import box
+from spokes import allocation_engine
 
 load_dotenv()
-client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
 console = Console()
+_client = None
+
+def _get_client():
+    """The OpenAI client, built on first use - the default local plan never imports openai."""
+    global _client
+    if _client is None:
+        import openai
+        _client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    return _client
 
 def save_plan_to_file(plan_data):
     """Saves the JSON plan to a readable text file."""
@@ -40,11 +51,170 @@ def save_plan_to_file(plan_data):
     
     console.print(f"\n[bold green]✅ Blueprint saved to: {os.path.abspath(filename)}[/bold green]")
 
-# ... imports remain the same ...
+def _messages(prompt):
+    return [
+        {"role": "system", "content": "You are a creative institutional investor. Output valid JSON."},
+        {"role": "user", "content": prompt}
+    ]
+
+class PlanStream:
+    """
+    Reads the plan's JSON while it is still arriving.
+    feed() returns a parsed snapshot each time another piece becomes complete:
+    a top-level field (archetype, rationale, allocation) or one blueprint row.
+    Snapshots are taken only at structural commas/brackets outside strings, and
+    the still-open brackets are closed for json.loads - so nothing half-written
+    (like a truncated ticker) ever reaches the screen.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._stack = []        # Open '{' / '[' at the current position
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text):
+        """Returns a list of (snapshot dict, open_key) - open_key is the top-level key still being written, if any."""
+        snapshots = []
+        start = len(self.buffer)
+        self.buffer += text
+        for i in range(start, len(self.buffer)):
+            char = self.buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._stack.append(char)
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if len(self._stack) <= 1:
+                    snapshots.append(self._snapshot(self.buffer[:i + 1], item_boundary=False))
+            elif char == ",":
+                if len(self._stack) == 1:
+                    snapshots.append(self._snapshot(self.buffer[:i], item_boundary=False))
+                elif len(self._stack) == 2 and self._stack[-1] == "[":
+                    snapshots.append(self._snapshot(self.buffer[:i], item_boundary=True))
+        return [snap for snap in snapshots if snap[0] is not None]
+
+    def _snapshot(self, prefix, item_boundary):
+        closers = "".join("}" if c == "{" else "]" for c in reversed(self._stack))
+        try:
+            data = json.loads(prefix + closers)
+        except ValueError:
+            return None, None
+        if not isinstance(data, dict):
+            return None, None
+        # Inside the blueprint array, that array (the last key so far) is still growing
+        open_key = next(reversed(data), None) if item_boundary else None
+        return data, open_key
+
+def _render_plan(data, open_key=None, footer=None):
+    """
+    Everything that is ready so far, as one renderable.
+    The header waits for archetype + rationale, the allocation table for the
+    whole allocation; blueprint rows appear one by one.
+    """
+    parts = []
+    if 'archetype' in data and 'rationale' in data and open_key not in ('archetype', 'rationale'):
+        parts.append(Panel(
+            Align.center(
+                f"[bold underline]{data.get('archetype', 'Investor')}[/bold underline]\n"
+                f"[italic]{data.get('rationale')}[/italic]\n\n"
+            ),
+            title="[bold cyan]Strategic Blueprint[/bold cyan]",
+            border_style="green",
+            padding=(1, 2)
+        ))
+
+    # Table 1: Broad Allocation
+    if 'allocation' in data and open_key != 'allocation':
+        alloc_table = Table(title="Target Allocation", box=None, padding=(0, 2), show_header=True) 
+        alloc_table.add_column("Broad Category", justify="right", style="cyan")
+        alloc_table.add_column("Weight", justify="left", style="bold green")
+
+        for asset, pct in data.get('allocation', {}).items():
+            # Only show non-zero categories to keep it clean
+            if pct != "0%" and pct != "0":
+                alloc_table.add_row(asset, pct)
+        parts.append(Align.center(alloc_table))
+
+    # Table 2: Vehicles
+    if data.get('blueprint'):
+        blue_table = Table(title="\nStrategic Vehicles", box=box.SIMPLE_HEAD, padding=(0, 2), expand=False)
+        blue_table.add_column("Ticker", style="bold yellow", width=8)
+        blue_table.add_column("Name", style="white", min_width=20)
+        blue_table.add_column("%", justify="center", style="green", width=6)
+        blue_table.add_column("Rationale", style="dim white")
+
+        for item in data.get('blueprint', []):
+            blue_table.add_row(
+                item.get('ticker', 'N/A'),
+                item.get('name', 'Asset'),
+                item.get('allocation', '0%'),
+                item.get('reason', '')
+            )
+        parts.append(Align.center(blue_table))
+
+    if footer:
+        parts.append(Text(footer, style="dim"))
+    return Group(*parts)
+
+def stream_plan(prompt):
+    """
+    Streams the completion and renders each part of the plan as soon as it is complete.
+    Returns the parsed plan (or None on error). A debug footer shows time-to-first-token,
+    time-to-first-render and total time.
+    """
+    parser = PlanStream()
+    start = time.perf_counter()
+    first_token = first_render = None
+    data, open_key = {}, None
+
+    def footer(done=False):
+        ttft = f"{first_token:.2f}s" if first_token is not None else "..."
+        ttfr = f"{first_render:.2f}s" if first_render is not None else "..."
+        total = f" | total {time.perf_counter() - start:.2f}s" if done else ""
+        return f"[debug] first token {ttft} | first render {ttfr}{total} | {len(parser.buffer)} chars"
+
+    waiting = Text("S.H.E.I.L.A. is calculating broad exposures...", style="bold cyan")
+    with Live(waiting, console=console, refresh_per_second=12) as live:
+        try:
+            response = _get_client().chat.completions.create(
+                model="gpt-4o-mini",
+                response_format={"type": "json_object"},
+                messages=_messages(prompt),
+                temperature=0.7, # High creativity to break the "NVDA/QQQ" loop
+                stream=True
+            )
+            for chunk in response:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                for data, open_key in parser.feed(chunk.choices[0].delta.content):
+                    if first_render is None and _render_plan(data, open_key).renderables:
+                        first_render = time.perf_counter() - start
+                    live.update(_render_plan(data, open_key, footer()))
+
+            # The closing brace is the last snapshot; fall back to a plain parse just in case
+            data = json.loads(parser.buffer)
+        except Exception as e:
+            live.update(Text(f"Error generating plan: {e}", style="red"))
+            return None
 
-# ... imports remain the same ...
+        live.update(_render_plan(data, None, footer(done=True)))
+    return data
 
-def run_architect():
+def run_architect(stream=True, enrich=False):
     console.clear()
     
     # HEADER UI
@@ -71,7 +241,7 @@ def run_architect():
         console.print("   [4] Aggressive Growth")
         console.print("   [5] College Fund")
         goal_choice = IntPrompt.ask("   [cyan]Select[/cyan]", choices=["1", "2", "3", "4", "5"], default=1)
-        goal_map = {1: "Retirement", 2: "House Downpayment", 3: "Passive Income", 4: "Aggressive Growth", 5: "College Fund"}
+        goal_map = dict(enumerate(allocation_engine.GOALS, start=1))
         final_goal = goal_map[goal_choice]
 
         # ASSET UNIVERSE
@@ -82,12 +252,7 @@ def run_architect():
         console.print("   [4] Safety First [dim](Bonds/CDs)[/dim]")
         
         univ_choice = IntPrompt.ask("   [cyan]Select[/cyan]", choices=["1", "2", "3", "4"], default=1)
-        univ_map = {
-            1: "ETFs Only",
-            2: "ETFs and Mutual Funds",
-            3: "ETFs and High-Conviction Individual Stocks",
-            4: "ETFs, Bonds, CDs, and Treasuries"
-        }
+        univ_map = dict(enumerate(allocation_engine.UNIVERSES, start=1))
         universe = univ_map[univ_choice]
 
         # RISK
@@ -96,7 +261,7 @@ def run_architect():
         console.print("   [2] Do nothing")
         console.print("   [3] Buy more")
         risk_choice = IntPrompt.ask("   [cyan]Action[/cyan]", choices=["1", "2", "3"], default=2)
-        risk_map = {1: "Sell / Low Tolerance", 2: "Hold / Medium Tolerance", 3: "Buy More / High Tolerance"}
+        risk_map = dict(enumerate(allocation_engine.RISK_LEVELS, start=1))
         final_risk = risk_map[risk_choice]
         
         horizon = IntPrompt.ask("\n[cyan]6. Time Horizon (Years)[/cyan]")
@@ -104,7 +269,18 @@ def run_architect():
     except KeyboardInterrupt:
         return
 
-    # 2. THE LOGIC (Broad & Creative)
+    # 2. THE LOGIC - the local rules engine drafts the plan (no network)
+    start = time.perf_counter()
+    draft = allocation_engine.build_plan(age, capital, final_goal, universe, final_risk, horizon)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if not enrich:
+        print("\n")
+        console.print(_render_plan(draft, footer=f"[debug] local rules engine: {elapsed_ms:.2f}ms (use --enrich for an AI pass)"))
+        save_plan_to_file(draft)
+        return
+
+    # Optional enrichment: the LLM starts from the draft (Broad & Creative)
     prompt = f"""
     <ROLE>
     You are S.H.E.I.L.A., a strategic financial architect. You use broad institutional asset classes.
@@ -154,77 +330,54 @@ def run_architect():
             }}
         ]
     }}
+
+    <LOCAL DRAFT>
+    S.H.E.I.L.A.'s rules engine already drafted this plan:
+    {json.dumps(draft)}
+    Keep its Allocation Table percentages. You may swap vehicles for more diverse ones in the
+    same category (the blueprint must still add up to 100%) and rewrite the archetype, rationale and reasons.
     """
     
     print("\n")
-    data = None
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[bold cyan]S.H.E.I.L.A. is calculating broad exposures...[/bold cyan]"),
-        transient=True
-    ) as progress:
-        progress.add_task("thinking", total=None)
-        
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                response_format={"type": "json_object"}, 
-                messages=[
-                    {"role": "system", "content": "You are a creative institutional investor. Output valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7 # High creativity to break the "NVDA/QQQ" loop
-            )
-            raw_json = response.choices[0].message.content.strip()
-            data = json.loads(raw_json)
+    if stream:
+        data = stream_plan(prompt)
+    else:
+        data = None
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[bold cyan]S.H.E.I.L.A. is calculating broad exposures...[/bold cyan]"),
+            transient=True
+        ) as progress:
+            progress.add_task("thinking", total=None)
             
-        except Exception as e:
-            console.print(f"[red]Error generating plan: {e}[/red]")
-            return
+            try:
+                response = _get_client().chat.completions.create(
+                    model="gpt-4o-mini",
+                    response_format={"type": "json_object"}, 
+                    messages=_messages(prompt),
+                    temperature=0.7 # High creativity to break the "NVDA/QQQ" loop
+                )
+                raw_json = response.choices[0].message.content.strip()
+                data = json.loads(raw_json)
+                
+            except Exception as e:
+                console.print(f"[red]Error generating plan: {e}[/red]")
+                return
 
-    # 3. THE RENDER
-    
-    # Table 1: Broad Allocation
-    alloc_table = Table(title="Target Allocation", box=None, padding=(0, 2), show_header=True) 
-    alloc_table.add_column("Broad Category", justify="right", style="cyan")
-    alloc_table.add_column("Weight", justify="left", style="bold green")
+        # 3. THE RENDER
+        console.print(_render_plan(data))
 
-    for asset, pct in data.get('allocation', {}).items():
-        # Only show non-zero categories to keep it clean
-        if pct != "0%" and pct != "0":
-            alloc_table.add_row(asset, pct)
+    if data:
+        save_plan_to_file(data)
 
-    # Table 2: Vehicles
-    blue_table = Table(title="\nStrategic Vehicles", box=box.SIMPLE_HEAD, padding=(0, 2), expand=False)
-    blue_table.add_column("Ticker", style="bold yellow", width=8)
-    blue_table.add_column("Name", style="white", min_width=20)
-    blue_table.add_column("%", justify="center", style="green", width=6)
-    blue_table.add_column("Rationale", style="dim white")
-
-    for item in data.get('blueprint', []):
-        blue_table.add_row(
-            item.get('ticker', 'N/A'),
-            item.get('name', 'Asset'),
-            item.get('allocation', '0%'),
-            item.get('reason', '')
-        )
-
-    console.print(Panel(
-        Align.center(
-            f"[bold underline]{data.get('archetype', 'Investor')}[/bold underline]\n"
-            f"[italic]{data.get('rationale')}[/italic]\n\n"
-        ),
-        title="[bold cyan]Strategic Blueprint[/bold cyan]",
-        border_style="green",
-        padding=(1, 2)
-    ))
-    
-    console.print(Align.center(alloc_table))
-    console.print(Align.center(blue_table))
-    
-    save_plan_to_file(data)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="The Architect - strategic investment planner.")
+    parser.add_argument("--enrich", action="store_true", help="Let GPT-4o-mini refine the local plan (needs OpenAI)")
+    parser.add_argument("--no-stream", action="store_true", help="With --enrich: wait for the whole plan behind a spinner instead of streaming it")
+    args = parser.parse_args(argv)
+    run_architect(stream=not args.no_stream, enrich=args.enrich)
 
 if __name__ == "__main__":
-    run_architect()
+    main()
 # ---> python3 -m spokes.proxy_finder
 # ---> python3 -m spokes.architect
\ No newline at end of file
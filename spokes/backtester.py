@@ -0,0 +1,153 @@
+"""
+The Backtester: how an Architect blueprint would have behaved historically.
+
+Daily closes for the blueprint's tickers are loaded once from the local
+PriceStore (only missing days are downloaded, so repeat runs stay
+offline) into one aligned date x ticker matrix. Each rebalance schedule
+is then simulated on that matrix with NumPy: between rebalances the
+weights drift with each holding's growth, and at every period end the
+portfolio is reset to target - no Python loop over days.
+
+Run: python -m spokes.backtester --years 20 --rebalance M Q A none
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from spokes.blueprint import BLUEPRINT_PATH, load_blueprint, percent
+
+# --- CONFIGURATION ---
+YEARS = 20                        # Default history to test over
+CASH_YIELD = 0.03                 # Annual yield assumed for cash-like holdings
+CASH_TICKERS = ("CASH", "CD-LADDER")
+SCHEDULES = {'M': "Monthly", 'Q': "Quarterly", 'A': "Annually", 'none': "Never (buy & hold)"}
+PERIODS = {'M': 'M', 'Q': 'Q', 'A': 'Y'}     # Schedule -> pandas period alias
+# ---------------------
+
+def blueprint_weights(plan):
+    """
+    The blueprint's vehicles as {ticker: weight}, normalized to sum to 1.
+    Returns (weights, raw_total) so the caller can warn when the plan didn't add up to 100%.
+    """
+    weights = {}
+    for vehicle in plan['blueprint']:
+        ticker = vehicle['ticker'].upper()
+        weights[ticker] = weights.get(ticker, 0.0) + percent(vehicle['allocation'])
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Blueprint has no weighted vehicles")
+    return {t: w / total for t, w in weights.items()}, total
+
+def load_prices(tickers, years=YEARS, store=None):
+    """
+    One aligned matrix of daily adjusted closes (date x ticker) for the market tickers,
+    starting on the first day every one of them has a price (later gaps are forward-filled).
+    Cash-like tickers get a synthetic series growing at CASH_YIELD.
+    """
+    from core.price_store import PriceStore # pandas only once there's something to load
+    market = [t for t in tickers if t not in CASH_TICKERS]
+    start = (date.today() - timedelta(days=int(years * 365))).isoformat()
+
+    own_store = store is None
+    store = store or PriceStore()
+    try:
+        if market:
+            store.update(market, lookback_days=int(years * 365))
+        closes = store.closes(market, start=start) if market else None
+    finally:
+        if own_store:
+            store.close()
+
+    if closes is None:
+        raise ValueError("Blueprint has no market tickers to backtest")
+    missing = [t for t in market if closes[t].isna().all()]
+    if missing:
+        raise ValueError(f"No price history for {', '.join(missing)}")
+
+    first = max(closes[t].first_valid_index() for t in market)
+    closes = closes.loc[first:].ffill()
+    days = (closes.index - closes.index[0]).days.to_numpy()
+    for ticker in tickers:
+        if ticker in CASH_TICKERS:
+            closes[ticker] = (1 + CASH_YIELD) ** (days / 365.0)
+    return closes[list(tickers)]
+
+def _rebalance_rows(index, schedule):
+    """Row numbers whose close we rebalance at: the last trading day of each period (never the final row)."""
+    import numpy as np
+    if schedule == 'none':
+        return np.empty(0, dtype=int)
+    periods = index.to_period(PERIODS[schedule]).asi8
+    return np.flatnonzero(periods[1:] != periods[:-1])
+
+def backtest(closes, weights, schedule='Q'):
+    """
+    closes:   aligned price matrix from load_prices()
+    weights:  {ticker: target weight}, summing to 1
+    schedule: 'M', 'Q', 'A' or 'none'
+
+    Between rebalances each holding just grows, so the portfolio on day t is
+    (value at the last rebalance) x sum_i w_i * P_i[t] / P_i[rebalance].
+    Returns {'values': growth of $1 (numpy array), 'cagr', 'max_drawdown', 'volatility',
+             'rebalances', 'start', 'end', 'milliseconds'}.
+    """
+    if schedule not in SCHEDULES:
+        raise ValueError(f"Unknown schedule '{schedule}'. Choose from {', '.join(SCHEDULES)}.")
+    import numpy as np
+    started = time.perf_counter()
+    prices = closes.to_numpy(dtype=float)
+    w = np.array([weights[t] for t in closes.columns])
+
+    rows = np.arange(len(prices))
+    bounds = np.r_[0, _rebalance_rows(closes.index, schedule)]
+    period = np.maximum(np.searchsorted(bounds, rows, side='left') - 1, 0)   # last rebalance strictly before each day
+    factor = (prices / prices[bounds[period]]) @ w                           # growth since that rebalance
+    level = np.cumprod(np.r_[1.0, factor[bounds[1:]]])                       # portfolio value at each rebalance
+    values = level[period] * factor
+
+    years = max((closes.index[-1] - closes.index[0]).days / 365.25, 1 / 365.25)
+    daily = values[1:] / values[:-1] - 1
+    return {
+        'values': values,
+        'cagr': float(values[-1] ** (1 / years) - 1),
+        'max_drawdown': float((values / np.maximum.accumulate(values) - 1).min()),
+        'volatility': float(daily.std(ddof=1) * np.sqrt(len(daily) / years)) if len(daily) > 1 else 0.0,
+        'rebalances': len(bounds) - 1,
+        'start': closes.index[0].strftime('%Y-%m-%d'),
+        'end': closes.index[-1].strftime('%Y-%m-%d'),
+        'milliseconds': (time.perf_counter() - started) * 1000,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtester - how your Architect blueprint would have done historically.")
+    parser.add_argument("--blueprint", default=BLUEPRINT_PATH, help="Blueprint file saved by the Architect")
+    parser.add_argument("--years", type=float, default=YEARS, help="History to test over")
+    parser.add_argument("--rebalance", nargs="+", default=list(SCHEDULES), choices=list(SCHEDULES),
+                        help="Rebalance schedule(s) to compare")
+    args = parser.parse_args(argv)
+
+    plan = load_blueprint(args.blueprint)
+    weights, total = blueprint_weights(plan)
+    print(f"\nS.H.E.I.L.A. | Backtester: {plan['archetype'] or 'Blueprint'}")
+    if abs(total - 1) > 1e-6:
+        print(f"   Note: blueprint weights add up to {total:.0%}; scaled to 100%.")
+    print("   Holdings: " + ", ".join(f"{t} {w:.1%}" for t, w in weights.items()))
+
+    start = time.perf_counter()
+    try:
+        closes = load_prices(list(weights), args.years)
+    except ValueError as e:
+        print(f"   ❌ {e}")
+        return 1
+    print(f"   Loaded {len(closes):,} days x {closes.shape[1]} tickers in {time.perf_counter() - start:.2f}s "
+          f"({closes.index[0]:%Y-%m-%d} to {closes.index[-1]:%Y-%m-%d})\n")
+
+    for schedule in args.rebalance:
+        result = backtest(closes, weights, schedule)
+        print(f"   {SCHEDULES[schedule]:<20} CAGR {result['cagr']:>6.2%} | Max drawdown {result['max_drawdown']:>7.2%} "
+              f"| Volatility {result['volatility']:>6.2%} | {result['rebalances']} rebalances [{result['milliseconds']:.1f}ms]")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Reads back the investment_blueprint.txt that the Architect saves
+(the inverse of architect.save_plan_to_file), so the simulator and the
+backtester can work from the last plan without calling the Architect.
+"""
+
+import re
+
+BLUEPRINT_PATH = "investment_blueprint.txt"
+
+_VEHICLE = re.compile(r"^(?P<ticker>\S+) \((?P<name>.*)\): (?P<allocation>[\d.]+%?) - (?P<reason>.*)$")
+
+def percent(value):
+    """'60%' / '60' / 60 -> 0.6"""
+    return float(str(value).strip().rstrip('%') or 0) / 100
+
+def load_blueprint(path=BLUEPRINT_PATH):
+    """
+    Returns the plan in the Architect's JSON shape:
+    {'archetype', 'rationale', 'allocation': {category: 'X%'}, 'blueprint': [{'ticker', 'name', 'allocation', 'reason'}]}
+    """
+    plan = {'archetype': None, 'rationale': None, 'allocation': {}, 'blueprint': []}
+    section = None
+    with open(path) as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line.startswith("--- TARGET ALLOCATION"):
+                section = 'allocation'
+            elif line.startswith("--- THE BLUEPRINT"):
+                section = 'blueprint'
+            elif line.startswith("====="):
+                section = None
+            elif line.startswith("Archetype: ") and section is None:
+                plan['archetype'] = line[len("Archetype: "):]
+            elif line.startswith("Rationale: ") and section is None:
+                plan['rationale'] = line[len("Rationale: "):]
+            elif section == 'allocation' and ": " in line:
+                category, pct = line.rsplit(": ", 1)
+                plan['allocation'][category] = pct
+            elif section == 'blueprint':
+                match = _VEHICLE.match(line)
+                if match:
+                    plan['blueprint'].append(match.groupdict())
+    return plan
@@ -0,0 +1,121 @@
+"""
+The math behind the Tax Scout, with no UI attached.
+
+Loads holdings into a DataFrame once, merges the same symbol across
+accounts, and computes market value, gain/loss and harvest flags as
+whole-column operations. The CLI (tax_scout) only renders the result,
+so the same engine can run headless from cron or other spokes.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Yahoo needs a -USD suffix for crypto
+CRYPTO_TICKERS = {'BTC', 'ETH', 'LTC'}
+
+# Status labels, in the order tax_scout renders them
+HARVEST = "HARVEST"
+WASH_RISK = "WASH_RISK"
+WATCH = "WATCH"
+HEALTHY = "HEALTHY"
+HOLD = "HOLD"
+NO_DATA = "NO_DATA"
+
+def quote_symbol(ticker):
+    """Maps a stored ticker to the symbol Yahoo knows it by."""
+    return f"{ticker}-USD" if ticker in CRYPTO_TICKERS else ticker
+
+def aggregate_positions(holdings):
+    """
+    holdings: iterable of (ticker, quantity, cost_basis) rows, one per lot/account.
+    Returns one row per ticker (index) with summed quantity and cost_basis,
+    plus how many lots were merged. 'UNKNOWN' and empty tickers are dropped.
+    """
+    lots = pd.DataFrame(list(holdings), columns=['ticker', 'quantity', 'cost_basis'])
+    lots = lots[lots['ticker'].notna() & (lots['ticker'] != '') & (lots['ticker'] != 'UNKNOWN')]
+    lots = lots.fillna({'quantity': 0.0, 'cost_basis': 0.0})
+
+    positions = lots.groupby('ticker', sort=False).agg(
+        quantity=('quantity', 'sum'),
+        cost_basis=('cost_basis', 'sum'),
+        lots=('quantity', 'size'),
+    )
+    positions['symbol'] = [quote_symbol(t) for t in positions.index]
+    return positions
+
+def analyze_holdings(holdings, prices, loss_threshold, min_harvest_amount, wash_qty=None):
+    """Shortcut: aggregate raw (ticker, quantity, cost_basis) rows, then analyze_positions()."""
+    return analyze_positions(aggregate_positions(holdings), prices, loss_threshold, min_harvest_amount, wash_qty)
+
+def analyze_positions(positions, prices, loss_threshold, min_harvest_amount, wash_qty=None):
+    """
+    Runs the harvest analysis in one vectorized pass.
+
+    positions: output of aggregate_positions()
+    prices:    {quote_symbol: live price}
+    wash_qty:  {ticker: shares bought in the last 30 days} (see wash_sale.recent_buys).
+               Same rule as wash_sale.find_wash_sales: a recent buy only replaces sold
+               shares if it is still held after the sale. The harvest here sells the
+               whole aggregated position, so recent buys inside it are sold too; only
+               shares that would be left over count. That share of the loss is held
+               back from the total, and a candidate left with less than
+               min_harvest_amount becomes WASH_RISK.
+
+    Returns a dict:
+      positions  DataFrame indexed by ticker: quantity, cost_basis, lots, symbol, price,
+                 market_value, avg_cost, gain_loss, gain_loss_pct, disallowed_loss,
+                 harvestable_loss, status
+      candidates the HARVEST rows, biggest loss first
+      total_harvest_loss  sum of candidate losses that survive the wash-sale check (negative number)
+    """
+    positions = positions.copy()
+    price = positions['symbol'].map(prices).astype(float).to_numpy()
+    qty = positions['quantity'].to_numpy(dtype=float)
+    cost = positions['cost_basis'].to_numpy(dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Derived Average Cost (Price per share) - zero when there is no quantity
+        avg_cost = np.where(qty != 0, cost / qty, 0.0)
+        market_value = price * qty
+        gain_loss = market_value - cost
+        gain_loss_pct = np.where(avg_cost > 0, (price - avg_cost) / avg_cost, 0.0)
+
+    has_price = ~np.isnan(price) & (price != 0)
+    positions['price'] = price
+    positions['market_value'] = market_value
+    positions['avg_cost'] = avg_cost
+    positions['gain_loss'] = gain_loss
+    positions['gain_loss_pct'] = gain_loss_pct
+
+    # DECISION LOGIC (first matching condition wins)
+    positions['status'] = np.select(
+        [
+            ~has_price,
+            (gain_loss_pct <= loss_threshold) & (gain_loss <= -min_harvest_amount),
+            gain_loss < 0,
+            gain_loss > 0,
+        ],
+        [NO_DATA, HARVEST, WATCH, HEALTHY],
+        default=HOLD,
+    )
+
+    # WASH-SALE CHECK: before = min(bought_before, held_after), as in wash_sale.find_wash_sales.
+    # Selling the recent buys along with the rest of the position is fine.
+    recent = positions.index.map(wash_qty or {}).to_numpy(dtype=float, na_value=0.0)
+    sold = np.maximum(qty, 0.0)  # The loss above assumes the whole position is sold
+    held_after = np.maximum(qty, 0.0) - sold
+    replacement = np.minimum(np.minimum(recent, held_after), sold)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        wash_share = np.where(sold > 0, replacement / sold, 0.0)
+    is_harvest = positions['status'].to_numpy() == HARVEST
+    disallowed = np.where(is_harvest, gain_loss * wash_share, 0.0)
+    positions['disallowed_loss'] = disallowed
+    positions['harvestable_loss'] = np.where(is_harvest, gain_loss - disallowed, 0.0)
+    positions.loc[is_harvest & (positions['harvestable_loss'].to_numpy() > -min_harvest_amount), 'status'] = WASH_RISK
+
+    candidates = positions[positions['status'] == HARVEST].sort_values('gain_loss')
+    return {
+        'positions': positions,
+        'candidates': candidates,
+        'total_harvest_loss': float(candidates['harvestable_loss'].sum()),
+    }
@@ -1,26 +1,33 @@
 import os
-import openai
+import sys
+import time
+import hashlib
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from core.database import SheilaVault
 
 load_dotenv()
 
-# Initialize OpenAI Client
-client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+# --- CONFIGURATION ---
+MODEL = "gpt-4o-mini"                # Fast & Cheap
+PROXY_CACHE_TTL = 7 * 24 * 60 * 60   # Re-use a proxy answer for a week
+PROXY_WORKERS = 4                    # Concurrent OpenAI requests for batch lookups
+RATE_LIMIT_RETRIES = 4               # Backoff attempts when OpenAI says "slow down"
+# ---------------------
 
-def get_proxy_suggestion(ticker):
-    """
-    Asks S.H.E.I.L.A. (via GPT-4o-mini) to find a tax-loss harvest proxy.
-    """
-    print(f"   S.H.E.I.L.A. is researching proxies for {ticker}...")
+SYSTEM_PROMPT = "You are S.H.E.I.L.A., a financial AI expert."
 
-    prompt = f"""
+PROMPT_TEMPLATE = """
 
     <YOUR ROLE>
     You are S.H.E.I.L.A., a non-professionally certified financial AI expert specializing in tax-loss harvesting strategies. You are only to recommend or suggest; never give official financial advice.
-    
+
     <CONTEXT>
     I am performing a Tax-Loss Harvest on the asset: {ticker}.
-    
+
     <TASK>
     Recommend ONE specific "Proxy Asset" that I can buy immediately to maintain similar market exposure.
 
@@ -42,22 +49,167 @@ def get_proxy_suggestion(ticker):
     IVV (Tracks S&P 500 like SPY)
     """
 
+# Changing the model or the wording produces a new hash, so stale answers are never served
+PROMPT_HASH = hashlib.sha256(f"{MODEL}\n{SYSTEM_PROMPT}\n{PROMPT_TEMPLATE}".encode()).hexdigest()[:16]
+
+# This session's cache numbers (lifetime numbers live in the vault)
+cache_stats = {'hits': 0, 'misses': 0, 'seconds_saved': 0.0, 'indexed': 0}
+
+_client = None
+_client_lock = threading.Lock() # Worker threads may all want it at once
+_index = None
+
+def _get_client():
+    """
+    The OpenAI client, built on first use. Importing openai takes longer than a
+    whole cached lookup, and index/cache hits never need it (or an API key).
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            import openai
+            _client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    return _client
+
+def _load_index():
+    """The local correlation index (spokes/proxy_index.py), loaded once. None if it was never built."""
+    global _index
+    if _index is None:
+        from spokes.proxy_index import ProxyIndex # numpy/pandas only when a lookup actually happens
+        _index = ProxyIndex.load() or False
+    return _index or None
+
+def _index_answer(ticker):
+    """A proxy from the correlation index, in the same shape as the model's answer - or None."""
+    index = _load_index()
+    substitutes = index.suggest(ticker, k=1) if index else []
+    if not substitutes:
+        return None
+    symbol, correlation, tracking_error = substitutes[0]
+    return f"{symbol} ({correlation:.2f} correlation, {tracking_error:.1%} tracking error)"
+
+def _ask_model(ticker):
+    """
+    One OpenAI round trip. Backs off exponentially (with jitter) on rate limits.
+    Returns (answer, seconds) - answer is an "Error finding proxy: ..." string on failure.
+    """
+    import openai
+    start = time.perf_counter()
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        try:
+            response = _get_client().chat.completions.create(
+                model=MODEL,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": PROMPT_TEMPLATE.format(ticker=ticker)}
+                ],
+                temperature=0.2
+            )
+            return response.choices[0].message.content.strip(), time.perf_counter() - start
+        except openai.RateLimitError as e:
+            if attempt == RATE_LIMIT_RETRIES:
+                return f"Error finding proxy: {e}", time.perf_counter() - start
+            time.sleep(2 ** attempt + random.random())
+        except Exception as e:
+            return f"Error finding proxy: {e}", time.perf_counter() - start
+
+def _is_error(answer):
+    return answer.startswith("Error finding proxy:")
+
+def get_proxy_suggestion(ticker, vault=None, use_cache=True, use_index=True):
+    """
+    Finds a tax-loss harvest proxy. Symbols in the local correlation index are
+    answered from it instantly; anything else asks S.H.E.I.L.A. (via GPT-4o-mini).
+    Model answers are cached in the vault per ticker + prompt version for PROXY_CACHE_TTL,
+    so asking again is instant and free.
+    """
+    return get_proxy_suggestions([ticker], vault, use_cache, use_index)[ticker]
+
+def get_proxy_suggestions(tickers, vault=None, use_cache=True, use_index=True, workers=PROXY_WORKERS):
+    """
+    Batch version of get_proxy_suggestion for a whole list of harvest candidates.
+    Index and cache hits are answered straight away; the misses go to OpenAI concurrently
+    ('workers' at a time). Returns {ticker: suggestion} in the original order.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    own_vault = vault is None
+    if own_vault:
+        vault = SheilaVault()
+
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini", # Fast & Cheap
-            messages=[
-                {"role": "system", "content": "You are S.H.E.I.L.A., a financial AI expert."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2
-        )
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        return f"Error finding proxy: {e}"
+        results = {}
+        misses = []
+        for ticker in tickers:
+            answer = _index_answer(ticker) if use_index else None
+            if answer:
+                results[ticker] = answer
+                cache_stats['indexed'] += 1
+                continue
+            cached = vault.get_cached_proxy(ticker, PROMPT_HASH, PROXY_CACHE_TTL) if use_cache else None
+            if cached:
+                results[ticker], latency = cached
+                cache_stats['hits'] += 1
+                cache_stats['seconds_saved'] += latency or 0.0
+            else:
+                misses.append(ticker)
+                if use_cache:
+                    cache_stats['misses'] += 1
+
+        if misses:
+            print(f"   S.H.E.I.L.A. is researching proxies for {', '.join(misses)}...")
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                answers = pool.map(_ask_model, misses)
+                for ticker, (answer, seconds) in zip(misses, answers):
+                    results[ticker] = answer
+                    if not _is_error(answer): # Errors are never cached
+                        vault.save_proxy(ticker, PROMPT_HASH, answer, seconds)
+
+        return {ticker: results[ticker] for ticker in tickers}
+    finally:
+        if own_vault:
+            vault.close()
+
+def cache_report(vault):
+    """One-line summary of this session's and the lifetime cache numbers."""
+    lifetime = vault.proxy_cache_stats()
+    lookups = cache_stats['hits'] + cache_stats['misses']
+    hit_rate = cache_stats['hits'] / lookups * 100 if lookups else 0.0
+    return (
+        f"Proxy cache: {cache_stats['hits']}/{lookups} hits this run ({hit_rate:.0f}%), "
+        f"{cache_stats['seconds_saved']:.1f}s saved | lifetime: {lifetime['entries']} entries, "
+        f"{lifetime['hits']} hits, {lifetime['seconds_saved']:.1f}s saved | "
+        f"{cache_stats['indexed']} answered by the local index"
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Proxy Finder - tax-loss harvest replacement ideas.")
+    parser.add_argument("ticker", nargs="?", default="BTC", help="Ticker to find a proxy for")
+    parser.add_argument("--no-cache", action="store_true", help="Always ask the model (still refreshes the cache)")
+    parser.add_argument("--no-index", action="store_true", help="Skip the local correlation index and ask the model")
+    parser.add_argument("--invalidate", nargs="?", const="*", metavar="TICKER",
+                        help="Drop cached answers for TICKER (or everything if no ticker is given) and exit")
+    parser.add_argument("--stats", action="store_true", help="Show cache hit rate and latency saved, then exit")
+    args = parser.parse_args(argv)
+
+    vault = SheilaVault()
+    try:
+        if args.invalidate:
+            removed = vault.invalidate_proxy_cache(None if args.invalidate == "*" else args.invalidate.upper())
+            print(f"Removed {removed} cached proxy answer(s).")
+            return 0
+        if args.stats:
+            print(cache_report(vault))
+            return 0
+
+        ticker = args.ticker.upper()
+        print(f"Testing Proxy Finder for {ticker}...")
+        suggestion = get_proxy_suggestion(ticker, vault, use_cache=not args.no_cache, use_index=not args.no_index)
+        print(f"Suggestion: {suggestion}")
+        print(cache_report(vault))
+        return 0
+    finally:
+        vault.close()
 
 # Quick Test Block
 if __name__ == "__main__":
-        test_ticker = "BTC"
-        print(f"Testing Proxy Finder for {test_ticker}...")
-        suggestion = get_proxy_suggestion(test_ticker)
-        print(f"Suggestion: {suggestion}")
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""
+The Proxy Index: harvest substitutes from local math instead of an API call.
+
+Keeps running sums of daily returns for a fixed universe of ETFs/stocks
+(count, sum, sum of squares and cross-products per pair), so new days are
+folded in without re-reading history. From those sums we get every pair's
+correlation and tracking error, and precompute each symbol's best
+substitutes: highly correlated, but with enough tracking error that it
+isn't the same fund under another name. A lookup is a dict access.
+
+Run: python -m spokes.proxy_index [--rebuild] [TICKER ...]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+# --- CONFIGURATION ---
+INDEX_PATH = 'data/proxy_index.npz'
+LOOKBACK_DAYS = 3 * 365        # History used for a fresh build
+TOP_K = 3                      # Substitutes kept per symbol
+MIN_CORRELATION = 0.80         # Below this it's not a proxy, it's a different bet
+MIN_TRACKING_ERROR = 0.01      # Annualized. Below 1% the two are likely 'substantially identical'
+MIN_OVERLAP_DAYS = 60          # Pairs with less shared history are ignored
+TRADING_DAYS = 252
+
+# Broad, sector, bond, real-estate and crypto exposures people actually harvest
+UNIVERSE = [
+    # US total market / large cap
+    'VTI', 'ITOT', 'SCHB', 'VOO', 'IVV', 'SPY', 'SPLG', 'RSP', 'SCHX', 'VV',
+    # Growth / Nasdaq
+    'QQQ', 'QQQM', 'ONEQ', 'VUG', 'SCHG', 'IWF',
+    # Small / mid / value
+    'VB', 'IJR', 'IWM', 'SCHA', 'VO', 'IJH', 'VTV', 'SCHV', 'IWD',
+    # International
+    'VXUS', 'IXUS', 'VEA', 'IEFA', 'SCHF', 'VWO', 'IEMG', 'SCHE',
+    # Sectors
+    'VGT', 'XLK', 'FTEC', 'SOXX', 'SMH', 'VHT', 'XLV', 'IYH', 'FHLC',
+    'VFH', 'XLF', 'VDE', 'XLE', 'VNQ', 'SCHH', 'XLRE', 'O', 'NNN',
+    # Bonds
+    'AGG', 'BND', 'SCHZ', 'IUSB', 'BNDX', 'TLT', 'VGLT', 'SPTL', 'IEF', 'VGIT',
+    # Crypto
+    'BTC-USD', 'ETH-USD', 'LTC-USD', 'IBIT', 'FBTC',
+]
+# ---------------------
+
+class ProxyIndex:
+    """
+    Sufficient statistics of daily returns for UNIVERSE, plus precomputed neighbors.
+    Pairwise sums (instead of dropping whole days) let symbols with different
+    trading calendars - crypto trades on weekends - share one index.
+    numpy/pandas are imported by the methods that need them, so loading this
+    module (e.g. for `fina index --help`) stays cheap.
+    """
+
+    def __init__(self, symbols):
+        import numpy as np
+        self.symbols = list(symbols)
+        self.position = {s: i for i, s in enumerate(self.symbols)}
+        k = len(self.symbols)
+        self.count = np.zeros((k, k))   # days both symbols traded
+        self.sum_x = np.zeros((k, k))   # sum of i's returns on those days
+        self.sum_xx = np.zeros((k, k))  # sum of i's squared returns on those days
+        self.sum_xy = np.zeros((k, k))  # sum of i*j returns
+        self.last_date = None           # 'YYYY-MM-DD' of the newest folded-in return
+        self.neighbors = {}             # symbol -> [(substitute, correlation, tracking_error)]
+
+    # --- Building ---
+
+    def update(self, returns):
+        """
+        Folds new daily returns (DataFrame: date index x symbol columns) into the sums.
+        Only rows newer than last_date are used, so calling this twice is harmless.
+        """
+        import pandas as pd
+        returns = returns.reindex(columns=self.symbols)
+        if self.last_date is not None:
+            returns = returns[returns.index > pd.Timestamp(self.last_date)]
+        returns = returns.dropna(how='all')
+        if returns.empty:
+            return 0
+
+        mask = returns.notna().to_numpy(dtype=float)
+        x = returns.fillna(0.0).to_numpy(dtype=float)
+        self.count += mask.T @ mask
+        self.sum_x += x.T @ mask
+        self.sum_xx += (x * x).T @ mask
+        self.sum_xy += x.T @ x
+        self.last_date = returns.index[-1].strftime('%Y-%m-%d')
+        self._rank()
+        return len(returns)
+
+    def statistics(self):
+        """Returns (correlation, annualized tracking error) matrices, NaN where history is too short."""
+        import numpy as np
+        with np.errstate(divide='ignore', invalid='ignore'):
+            n = np.where(self.count >= MIN_OVERLAP_DAYS, self.count, np.nan)
+            mean = self.sum_x / n                   # mean of i over days shared with j
+            var = self.sum_xx / n - mean ** 2
+            cov = self.sum_xy / n - mean * mean.T
+            correlation = cov / np.sqrt(var * var.T)
+            tracking = np.sqrt(np.maximum(var + var.T - 2 * cov, 0.0) * TRADING_DAYS)
+        return correlation, tracking
+
+    def _rank(self, top_k=TOP_K):
+        """Precomputes every symbol's best substitutes, so suggest() is just a lookup."""
+        import numpy as np
+        correlation, tracking = self.statistics()
+        eligible = (correlation >= MIN_CORRELATION) & (tracking >= MIN_TRACKING_ERROR)
+        np.fill_diagonal(eligible, False)
+        scores = np.where(eligible, correlation, -np.inf)
+        order = np.argsort(-scores, axis=1)[:, :top_k]
+
+        self.neighbors = {}
+        for i, symbol in enumerate(self.symbols):
+            self.neighbors[symbol] = [
+                (self.symbols[j], float(correlation[i, j]), float(tracking[i, j]))
+                for j in order[i] if eligible[i, j]
+            ]
+
+    # --- Lookups ---
+
+    def __contains__(self, ticker):
+        from spokes.harvest_engine import quote_symbol
+        return quote_symbol(ticker) in self.position
+
+    def suggest(self, ticker, k=TOP_K):
+        """[(substitute, correlation, tracking_error)] best first; [] if nothing qualifies or ticker is unknown."""
+        from spokes.harvest_engine import quote_symbol
+        return self.neighbors.get(quote_symbol(ticker), [])[:k]
+
+    # --- Persistence ---
+
+    def save(self, path=INDEX_PATH):
+        import numpy as np
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path,
+            symbols=np.array(self.symbols),
+            count=self.count, sum_x=self.sum_x, sum_xx=self.sum_xx, sum_xy=self.sum_xy,
+            last_date=np.array(self.last_date or ""),
+        )
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        """Returns the saved index, or None if there isn't one yet."""
+        if not os.path.exists(path):
+            return None
+        import numpy as np
+        with np.load(path) as data:
+            index = cls(data['symbols'].tolist())
+            index.count = data['count']
+            index.sum_x = data['sum_x']
+            index.sum_xx = data['sum_xx']
+            index.sum_xy = data['sum_xy']
+            index.last_date = str(data['last_date']) or None
+        index._rank()
+        return index
+
+def refresh_index(path=INDEX_PATH, universe=UNIVERSE, rebuild=False, store=None):
+    """
+    Loads the index and folds in any trading days since it was last updated.
+    A changed universe (or rebuild=True) starts over from LOOKBACK_DAYS of history.
+    Prices come from the local PriceStore, which only downloads what it is missing.
+    Returns (index, new_days).
+    """
+    from core.price_store import PriceStore
+    index = None if rebuild else ProxyIndex.load(path)
+    if index is None or index.symbols != list(universe):
+        index = ProxyIndex(universe)
+
+    own_store = store is None
+    store = store or PriceStore()
+    try:
+        store.update(universe, lookback_days=LOOKBACK_DAYS)
+        # Read a week before the last folded-in day, so every symbol has a base close
+        # for its first new return; update() skips the days it already has.
+        # Stop at yesterday: today's bar may still be moving.
+        if index.last_date:
+            start = (date.fromisoformat(index.last_date) - timedelta(days=7)).isoformat()
+        else:
+            start = (date.today() - timedelta(days=LOOKBACK_DAYS)).isoformat()
+        end = (date.today() - timedelta(days=1)).isoformat()
+        new_days = index.update(store.returns(universe, start=start, end=end))
+    finally:
+        if own_store:
+            store.close()
+
+    if new_days:
+        index.save(path)
+    return index, new_days
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Proxy Index - correlation-based harvest substitutes.")
+    parser.add_argument("tickers", nargs="*", help="Tickers to look up")
+    parser.add_argument("--rebuild", action="store_true", help=f"Rebuild from {LOOKBACK_DAYS} days of history")
+    parser.add_argument("--no-refresh", action="store_true", help="Use the saved index as-is (no network)")
+    args = parser.parse_args(argv)
+
+    if args.no_refresh:
+        index = ProxyIndex.load()
+        if index is None:
+            print(f"No index at {INDEX_PATH} yet. Run without --no-refresh first.")
+            return 1
+    else:
+        print(f"S.H.E.I.L.A. | Refreshing proxy index ({len(UNIVERSE)} symbols)...")
+        index, new_days = refresh_index(rebuild=args.rebuild)
+        print(f"   Added {new_days} trading day(s). Index current through {index.last_date}.")
+
+    for ticker in args.tickers:
+        ticker = ticker.upper()
+        start = time.perf_counter()
+        substitutes = index.suggest(ticker)
+        elapsed = (time.perf_counter() - start) * 1e6
+        if ticker not in index:
+            print(f"   {ticker}: not in the index")
+        elif not substitutes:
+            print(f"   {ticker}: no substitute clears the correlation/tracking-error bar")
+        else:
+            ideas = ", ".join(f"{s} (corr {c:.2f}, TE {t:.1%})" for s, c, t in substitutes)
+            print(f"   {ticker}: {ideas}  [{elapsed:.0f}µs]")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
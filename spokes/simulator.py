@@ -0,0 +1,161 @@
+"""
+The Simulator: Monte Carlo projection of an Architect blueprint.
+
+Takes the blueprint's Target Allocation, draws correlated quarterly returns
+for each broad asset class (Cholesky of the covariance matrix), and grows
+tens of thousands of portfolios over the horizon at once with NumPy.
+Paths are generated in fixed-size chunks, each from its own spawned seed,
+so results are reproducible and identical whether the chunks run in this
+process or across a process pool.
+
+Returns are nominal and the capital-market assumptions below are long-run
+guesses, not forecasts.
+
+Run: python -m spokes.simulator --capital 5000 --years 30 --goal 100000
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from spokes.blueprint import BLUEPRINT_PATH, load_blueprint, percent
+
+# --- CONFIGURATION ---
+PATHS = 50_000               # Simulated portfolios
+CHUNK_PATHS = 10_000         # Paths per chunk (the unit of work for the process pool)
+STEPS_PER_YEAR = 4           # Quarterly returns, rebalanced back to target each quarter
+PERCENTILES = (5, 25, 50, 75, 95)
+SEED = 42
+
+# Broad categories as the Architect names them: (annual expected return, annual volatility)
+ASSET_CLASSES = ("Equities", "Fixed Income", "Real Assets", "Cash")
+ASSUMPTIONS = {
+    "Equities": (0.07, 0.16),
+    "Fixed Income": (0.04, 0.06),
+    "Real Assets": (0.055, 0.18),
+    "Cash": (0.03, 0.01),
+}
+CORRELATION = np.array([
+    # EQ    FI    RA    CASH
+    [1.00, 0.10, 0.60, 0.00],
+    [0.10, 1.00, 0.20, 0.10],
+    [0.60, 0.20, 1.00, 0.00],
+    [0.00, 0.10, 0.00, 1.00],
+])
+# ---------------------
+
+def _asset_class(category):
+    """Maps the Architect's category labels ('Real Assets / Alts', 'Cash & Equivalents'...) to ASSET_CLASSES."""
+    label = category.lower()
+    for keywords, asset_class in ((("equit", "stock"), "Equities"), (("fixed", "bond"), "Fixed Income"),
+                                  (("real", "alt", "commod"), "Real Assets"), (("cash", "money"), "Cash")):
+        if any(k in label for k in keywords):
+            return asset_class
+    raise ValueError(f"Unknown asset category '{category}'")
+
+def allocation_weights(allocation):
+    """{'Equities': '60%', ...} -> weight vector over ASSET_CLASSES, normalized to sum to 1."""
+    weights = np.zeros(len(ASSET_CLASSES))
+    for category, pct in allocation.items():
+        weights[ASSET_CLASSES.index(_asset_class(category))] += percent(pct)
+    if weights.sum() <= 0:
+        raise ValueError("Allocation has no weight")
+    return weights / weights.sum()
+
+def _step_parameters():
+    """Per-step (quarterly) log-return drift and Cholesky factor of the per-step covariance."""
+    mu = np.array([ASSUMPTIONS[c][0] for c in ASSET_CLASSES])
+    sigma = np.array([ASSUMPTIONS[c][1] for c in ASSET_CLASSES])
+    log_mu = np.log1p(mu) - sigma ** 2 / 2          # so the arithmetic mean matches mu
+    drift = log_mu / STEPS_PER_YEAR
+    cov = CORRELATION * np.outer(sigma, sigma) / STEPS_PER_YEAR
+    return drift, np.linalg.cholesky(cov)
+
+def _simulate_chunk(seed, paths, years, weights, capital, contribution):
+    """
+    One chunk of paths. Runs in a worker process when a pool is used.
+    Returns year-end wealth, shape (paths, years).
+    """
+    rng = np.random.default_rng(seed)
+    drift, chol = _step_parameters()
+    wealth = np.full(paths, float(capital))
+    year_end = np.empty((paths, years))
+    step_contribution = contribution / STEPS_PER_YEAR
+
+    # One year of shocks at a time keeps memory flat no matter how long the horizon is
+    for year in range(years):
+        shocks = rng.standard_normal((paths, STEPS_PER_YEAR, len(ASSET_CLASSES))) @ chol.T
+        growth = np.expm1(drift + shocks) @ weights + 1.0         # (paths, steps) portfolio growth factors
+        if step_contribution:
+            for step in range(STEPS_PER_YEAR):
+                wealth = wealth * growth[:, step] + step_contribution
+        else:
+            wealth = wealth * growth.prod(axis=1)
+        year_end[:, year] = wealth
+    return year_end
+
+def simulate(allocation, capital, years, goal=None, contribution=0.0, paths=PATHS, workers=1, seed=SEED):
+    """
+    allocation:   the blueprint's Target Allocation ({category: 'X%'})
+    capital:      starting amount
+    years:        horizon
+    goal:         target amount at the horizon (optional)
+    contribution: amount added per year (spread over the steps)
+    workers:      >1 splits the chunks across a process pool
+
+    Returns {'percentiles': {p: terminal wealth}, 'by_year': {p: [year-end wealth]},
+             'probability': chance of ending at/above goal (None without a goal),
+             'paths': paths, 'seconds': runtime}
+    """
+    start = time.perf_counter()
+    weights = allocation_weights(allocation)
+    years = max(1, int(years))
+    sizes = [min(CHUNK_PATHS, paths - i) for i in range(0, paths, CHUNK_PATHS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(s, n, years, weights, capital, contribution) for s, n in zip(seeds, sizes)]
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_simulate_chunk, *zip(*jobs)))
+    else:
+        chunks = [_simulate_chunk(*job) for job in jobs]
+    year_end = np.concatenate(chunks)
+
+    terminal = year_end[:, -1]
+    by_year = np.percentile(year_end, PERCENTILES, axis=0)
+    return {
+        'percentiles': dict(zip(PERCENTILES, np.percentile(terminal, PERCENTILES).tolist())),
+        'by_year': {p: row.tolist() for p, row in zip(PERCENTILES, by_year)},
+        'probability': float((terminal >= goal).mean()) if goal else None,
+        'paths': len(terminal),
+        'seconds': time.perf_counter() - start,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulator - Monte Carlo projection of your Architect blueprint.")
+    parser.add_argument("--blueprint", default=BLUEPRINT_PATH, help="Blueprint file saved by the Architect")
+    parser.add_argument("--capital", type=float, required=True, help="Starting amount")
+    parser.add_argument("--years", type=int, required=True, help="Horizon in years")
+    parser.add_argument("--goal", type=float, help="Target amount at the horizon")
+    parser.add_argument("--contribution", type=float, default=0.0, help="Amount added per year (spread over the quarters)")
+    parser.add_argument("--paths", type=int, default=PATHS, help="Number of simulated portfolios")
+    parser.add_argument("--workers", type=int, default=1, help="Processes to spread the paths over")
+    parser.add_argument("--seed", type=int, default=SEED)
+    args = parser.parse_args(argv)
+
+    plan = load_blueprint(args.blueprint)
+    result = simulate(plan['allocation'], args.capital, args.years, args.goal, args.contribution,
+                      args.paths, args.workers, args.seed)
+
+    print(f"\nS.H.E.I.L.A. | Simulator: {plan['archetype'] or 'Blueprint'}")
+    print("   Allocation: " + ", ".join(f"{c} {p}" for c, p in plan['allocation'].items()))
+    print(f"   {result['paths']:,} paths x {args.years} years in {result['seconds']:.2f}s\n")
+    for p, value in result['percentiles'].items():
+        print(f"   {p:>3}th percentile: ${value:,.0f}")
+    if result['probability'] is not None:
+        print(f"\n   Probability of reaching ${args.goal:,.0f}: {result['probability']:.1%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
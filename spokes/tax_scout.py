@@ -1,113 +1,392 @@
-import yfinance as yf
-import pandas as pd
+import argparse
+import contextlib
+import csv
+import json
 import sqlite3
+import sys
 import time
-from datetime import datetime
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn
-from rich.align import Align
-from rich import box
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 from core.database import SheilaVault
+from spokes import wash_sale
 
 # --- CONFIGURATION ---
 LOSS_THRESHOLD = -0.05       # Trigger alert if asset is down 5%
 MIN_HARVEST_AMOUNT = 100.00  # Only harvest if loss is > $100 (Save on fees/effort)
+QUOTE_TTL_SECONDS = 15 * 60  # Re-use a cached price for this long while the market is open
+QUOTE_CHUNK_SIZE = 50        # Symbols per Yahoo request
+QUOTE_WORKERS = 4            # Chunks downloaded at the same time
+QUOTE_RETRIES = 2            # Extra attempts for a chunk that errors out
+TOP_N = 25                   # Rows shown in the interactive view (use --all for everything)
 # ---------------------
 
-console = Console()
+# yfinance error text that means "this symbol has no data" (not worth a retry)
+NO_DATA_ERRORS = ("delisted", "no data found", "no price data", "not found", "no timezone")
 
-def fetch_current_prices(tickers):
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = (9, 30)
+MARKET_CLOSE = (16, 0)
+
+def _last_market_close(now):
+    """
+    Returns the most recent regular-session close (16:00 ET, Mon-Fri) at or before 'now',
+    or None if the market is open right now. Exchange holidays are treated as trading days.
+    """
+    local = now.astimezone(MARKET_TZ)
+    open_time = local.replace(hour=MARKET_OPEN[0], minute=MARKET_OPEN[1], second=0, microsecond=0)
+    close_time = local.replace(hour=MARKET_CLOSE[0], minute=MARKET_CLOSE[1], second=0, microsecond=0)
+
+    if local.weekday() < 5:
+        if open_time <= local < close_time:
+            return None
+        if local >= close_time:
+            return close_time
+
+    # Before the open or on a weekend: walk back to the previous weekday's close
+    day = close_time - timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+def _quote_is_fresh(symbol, fetched_at, now, ttl=QUOTE_TTL_SECONDS):
+    """
+    A cached quote is fresh if it is younger than the TTL, or - for stocks/ETFs -
+    if it was fetched after the last close while the market is still closed
+    (the price can't have moved since). Crypto trades 24/7 and only gets the TTL.
+    """
+    if now.timestamp() - fetched_at < ttl:
+        return True
+    if symbol.endswith("-USD"):
+        return False
+    last_close = _last_market_close(now)
+    return last_close is not None and fetched_at >= last_close.timestamp()
+
+def _last_close_date(now):
+    """Date of the most recent completed session - the freshest close anyone can have."""
+    last_close = _last_market_close(now)
+    if last_close is None: # Market is open: the last completed session was the previous weekday
+        last_close = _last_market_close(now.astimezone(MARKET_TZ).replace(hour=MARKET_OPEN[0], minute=0))
+    return last_close.date()
+
+def _download_prices(search_tickers):
+    """
+    One batched yfinance call -> {symbol: last close}. yfinance never raises for a
+    failed symbol here - it hands back an empty column - so a symbol missing from the
+    result could be delisted or could have been throttled; _download_chunk asks again.
+    """
+    import pandas as pd
+    import yfinance as yf # Imported on first download: a fully cached run never loads it
+
+    # Download 1 day of data (threads=False: we already run chunks in parallel ourselves)
+    frame = yf.download(search_tickers, period="1d", progress=False, threads=False)
+    data = frame['Close'] if frame is not None and 'Close' in frame else pd.DataFrame()
+    
+    prices = {}
+    
+    # If we requested 1 ticker, it returns a Series
+    if len(search_tickers) == 1 and not isinstance(data, pd.DataFrame):
+        val = data.iloc[-1].item() if not data.empty else None
+        if val is not None and pd.notna(val):
+            prices[search_tickers[0]] = val
+    elif not data.empty:
+        # Multi-ticker DataFrame
+        last_row = data.iloc[-1]
+        for t in search_tickers:
+            try:
+                price = last_row[t]
+                if pd.notna(price):
+                    prices[t] = float(price)
+            except KeyError:
+                pass
+    return prices
+
+def _download_symbol(symbol):
+    """
+    One symbol on its own, through the per-ticker API that raises instead of staying
+    quiet (raise_errors=True). Returns the last close, or None if Yahoo has no rows.
+    """
+    import yfinance as yf
+
+    history = yf.Ticker(symbol).history(period="1d", raise_errors=True)
+    if history is None or history.empty or 'Close' not in history:
+        return None
+    closes = history['Close'].dropna()
+    return float(closes.iloc[-1]) if len(closes) else None
+
+def _is_transient(message):
+    """True for errors worth retrying (network, throttling), False for 'this symbol has no data'."""
+    message = message.lower()
+    return not any(marker in message for marker in NO_DATA_ERRORS)
+
+def _download_chunk(chunk, retries=QUOTE_RETRIES):
+    """
+    Runs on a worker thread. One batched download for the whole chunk, then every
+    symbol it didn't price is asked for on its own, so each one is judged by what
+    happened to it: a "no data" error or an empty answer is final (no_data), while
+    any other error (network, throttling) is retried with backoff.
+    Returns (prices, seconds, failed) - failed is {symbol: error} after the last attempt.
+    """
+    start = time.perf_counter()
+    try:
+        prices = _download_prices(chunk)
+    except Exception:
+        prices = {} # The per-symbol pass below finds out why
+    pending = [symbol for symbol in chunk if symbol not in prices]
+
+    failed = {}
+    for attempt in range(retries + 1):
+        failed = {}
+        for symbol in pending:
+            try:
+                price = _download_symbol(symbol)
+            except Exception as e:
+                if _is_transient(str(e)):
+                    failed[symbol] = str(e) or repr(e)
+                continue
+            if price is not None:
+                prices[symbol] = price
+
+        if not failed:
+            break
+        pending = list(failed)
+        if attempt < retries:
+            time.sleep(0.5 * 2 ** attempt)
+    return prices, time.perf_counter() - start, failed
+
+def fetch_quotes(tickers, vault=None, ttl=QUOTE_TTL_SECONDS, on_progress=None, offline=False):
     """
     Fetches live prices for a list of tickers using yfinance.
+    Prices are cached in the vault: only stale or missing symbols are
+    downloaded, split into chunks that are fetched concurrently.
+    'on_progress(n)' is called as each batch of n symbols is resolved.
+    'offline' prices from Plaid's stored close first (zero network) and
+    only reaches out for securities whose close is stale or missing.
+
+    Returns a report dict:
+      prices        {symbol: price}
+      plaid         symbols priced from Plaid's stored close (offline mode)
+      cached        symbols served from the cache
+      failed        symbols that still failed after retries (network/throttling)
+      no_data       symbols Yahoo answered for, but without a price
+      chunk_latency [seconds, ...] one entry per downloaded chunk
     """
+    report = {'prices': {}, 'plaid': [], 'cached': [], 'failed': [], 'no_data': [], 'chunk_latency': []}
     if not tickers:
-        return {}
+        return report
+    from spokes import harvest_engine
     
     # Map crypto if needed (Yahoo requires -USD suffix)
-    search_tickers = []
-    for t in tickers:
-        if t in ['BTC', 'ETH', 'LTC']:
-            search_tickers.append(f"{t}-USD")
-        else:
-            search_tickers.append(t)
-            
+    search_tickers = list(dict.fromkeys(harvest_engine.quote_symbol(t) for t in tickers))
+
+    own_vault = vault is None
+    if own_vault:
+        vault = SheilaVault()
+
     try:
-        # Download 1 day of data
-        data = yf.download(search_tickers, period="1d", progress=False)['Close']
-        
-        prices = {}
+        now = datetime.now().astimezone()
+        prices = report['prices']
+        stale = []
+
+        # Offline: Plaid already told us the last close during sync
+        plaid_closes = {}
+        if offline:
+            newest_possible = str(_last_close_date(now))
+            for ticker, (price, as_of) in vault.get_holding_closes().items():
+                if as_of and as_of >= newest_possible:
+                    plaid_closes[harvest_engine.quote_symbol(ticker)] = price
+
+        cached = vault.get_cached_quotes(search_tickers)
+        for symbol in search_tickers:
+            if symbol in plaid_closes:
+                prices[symbol] = plaid_closes[symbol]
+                report['plaid'].append(symbol)
+            elif symbol in cached and _quote_is_fresh(symbol, cached[symbol][1], now, ttl):
+                prices[symbol] = cached[symbol][0]
+                report['cached'].append(symbol)
+            else:
+                stale.append(symbol)
+        resolved = len(search_tickers) - len(stale)
+        if on_progress and resolved:
+            on_progress(resolved)
+
+        chunks = [stale[i:i + QUOTE_CHUNK_SIZE] for i in range(0, len(stale), QUOTE_CHUNK_SIZE)]
+        with ThreadPoolExecutor(max_workers=QUOTE_WORKERS) as pool:
+            futures = {pool.submit(_download_chunk, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                fresh, seconds, failed = future.result()
+                report['chunk_latency'].append(seconds)
+
+                vault.save_quotes(fresh, fetched_at=now.timestamp())
+                prices.update(fresh)
+                report['failed'].extend(failed)
+                # Better an old price than none at all
+                for symbol in failed:
+                    if symbol in cached:
+                        prices[symbol] = cached[symbol][0]
+                report['no_data'].extend(symbol for symbol in chunk if symbol not in fresh and symbol not in failed)
+
+                if on_progress:
+                    on_progress(len(chunk))
+
+        return report
+    finally:
+        if own_vault:
+            vault.close()
+
+def fetch_current_prices(tickers, vault=None, ttl=QUOTE_TTL_SECONDS):
+    """Shortcut for fetch_quotes() when all you need is {symbol: price}."""
+    return fetch_quotes(tickers, vault, ttl)['prices']
+
+# Exit codes for headless runs (cron can branch on these)
+EXIT_OK = 0          # Nothing to harvest
+EXIT_ERROR = 1       # Couldn't run (no DB / no holdings)
+EXIT_HARVEST = 2     # Harvest candidates found
+
+REPORT_FIELDS = ['ticker', 'symbol', 'lots', 'quantity', 'cost_basis', 'price',
+                 'market_value', 'gain_loss', 'gain_loss_pct', 'disallowed_loss', 'status']
+
+def _report_rows(positions):
+    """Yields one plain dict per position (NaN -> None) in REPORT_FIELDS order."""
+    for row in positions.itertuples():
+        record = {'ticker': row.Index}
+        for field in REPORT_FIELDS[1:]:
+            value = getattr(row, field)
+            if isinstance(value, float) and value != value: # NaN
+                value = None
+            elif hasattr(value, 'item'): # numpy scalar -> plain Python
+                value = value.item()
+            record[field] = value
+        yield record
+
+def stream_report(positions, output_format, stream):
+    """
+    Writes positions as JSON Lines or CSV, one row at a time (flushed as it goes),
+    so large portfolios never build a giant table in memory.
+    """
+    if output_format == "csv":
+        writer = csv.DictWriter(stream, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        for record in _report_rows(positions):
+            writer.writerow(record)
+            stream.flush()
+    else:
+        for record in _report_rows(positions):
+            stream.write(json.dumps(record) + "\n")
+            stream.flush()
+
+def run_tax_scout(output_format="table", output_path=None, top=TOP_N, show_all=False, offline=False, proxies=False):
+    """
+    output_format: "table" (interactive rich view), "jsonl" or "csv" (headless stream)
+    output_path:   file for headless output (default: stdout)
+    top:           interactive view only shows the top-N rows (biggest losses first)
+    show_all:      interactive view shows every row, in a pager
+    offline:       price from Plaid's stored closes, only fetch what's stale/missing
+    proxies:       interactive view lists a replacement idea per candidate (OpenAI, cached)
+    Returns one of the EXIT_* codes.
+    """
+    # Heavy imports wait until there is a scan to run, so --help and bad flags answer instantly
+    from rich.console import Console
+    from rich.table import Table
+    from rich.panel import Panel
+    from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn
+    from rich.align import Align
+    from rich import box
+    from spokes import harvest_engine
+
+    console = Console()
+    interactive = output_format == "table"
+    # Headless runs keep stdout clean for the data - status goes to stderr
+    ui = console if interactive else Console(stderr=True)
+
+    if interactive:
+        console.clear()
         
-        # If we requested 1 ticker, it returns a Series
-        if len(search_tickers) == 1:
-            val = data.iloc[-1].item() if not data.empty else None
-            prices[search_tickers[0]] = val
-        else:
-            # Multi-ticker DataFrame
-            last_row = data.iloc[-1]
-            for t in search_tickers:
-                try:
-                    price = last_row[t]
-                    if pd.notna(price):
-                        prices[t] = price
-                except KeyError:
-                    pass
-                    
-        return prices
-    except Exception as e:
-        console.print(f"[red]API Error:[/red] {e}")
-        return {}
-
-def run_tax_scout():
-    console.clear()
-    
-    # HEADER UI
-    console.print(Panel.fit(
-        Align.center("[bold green]TAX SCOUT[/bold green]\n[dim]Loss Harvesting Engine[/dim]"),
-        border_style="green",
-        padding=(1, 2)
-    ))
+        # HEADER UI
+        console.print(Panel.fit(
+            Align.center("[bold green]TAX SCOUT[/bold green]\n[dim]Loss Harvesting Engine[/dim]"),
+            border_style="green",
+            padding=(1, 2)
+        ))
     
-    vault = SheilaVault()
-    console.print("\n[bold]1. Scanning Portfolio Database...[/bold]")
+    if interactive:
+        vault = SheilaVault()
+    else:
+        with contextlib.redirect_stdout(sys.stderr): # Vault startup chatter must not end up in the data stream
+            vault = SheilaVault()
+    ui.print("\n[bold]1. Scanning Portfolio Database...[/bold]")
     
     # 1. GET HOLDINGS (FIXED COLUMN NAME)
     try:
         vault.cursor.execute("SELECT ticker, quantity, cost_basis FROM holdings")
         holdings = vault.cursor.fetchall()
     except sqlite3.OperationalError as e:
-        console.print(f"[bold red]Database Error:[/bold red] {e}")
-        console.print("[yellow]Tip: Run 'clean_db.py' and 'setup_server.py' to reset your schema if this persists.[/yellow]")
-        return
+        ui.print(f"[bold red]Database Error:[/bold red] {e}")
+        ui.print("[yellow]Tip: Run 'clean_db.py' and 'setup_server.py' to reset your schema if this persists.[/yellow]")
+        return EXIT_ERROR
     
     if not holdings:
-        console.print("[yellow]   No holdings found in database. Run 'setup_server.py' or check DB.[/yellow]")
-        return
+        ui.print("[yellow]   No holdings found in database. Run 'setup_server.py' or check DB.[/yellow]")
+        return EXIT_ERROR
 
-    # Clean list of tickers
-    active_tickers = [h[0] for h in holdings if h[0] and h[0] != 'UNKNOWN']
+    # One row per symbol, merged across accounts
+    positions = harvest_engine.aggregate_positions(holdings)
+    active_tickers = list(positions.index)
     
     # 2. FETCH PRICES
-    current_prices = {}
     with Progress(
         SpinnerColumn(),
         BarColumn(),
         TextColumn("[cyan]Fetching live market data for {task.total} assets...[/cyan]"),
-        transient=True
+        console=ui,
+        transient=True,
+        disable=not interactive
     ) as progress:
         task = progress.add_task("download", total=len(active_tickers))
         
-        raw_prices = fetch_current_prices(active_tickers)
-        
-        for _ in active_tickers:
-            time.sleep(0.05) 
-            progress.advance(task)
-            
-        current_prices = raw_prices
+        # The bar moves as chunks actually finish
+        quotes = fetch_quotes(active_tickers, vault, on_progress=lambda n: progress.advance(task, n), offline=offline)
+        current_prices = quotes['prices']
+
+    if quotes['chunk_latency']:
+        latencies = sorted(quotes['chunk_latency'])
+        ui.print(
+            f"[dim]   {len(quotes['plaid'])} from Plaid, {len(quotes['cached'])} cached, {len(latencies)} chunk(s) downloaded "
+            f"(median {latencies[len(latencies) // 2]:.2f}s, slowest {latencies[-1]:.2f}s)[/dim]"
+        )
+    else:
+        ui.print(f"[dim]   No network needed: {len(quotes['plaid'])} from Plaid, {len(quotes['cached'])} cached[/dim]")
 
-    # 3. CALCULATE & RENDER
+    # 3. CALCULATE (recent buys in any account can turn a loss into a wash sale)
+    recent = wash_sale.recent_buys(vault.get_trades((datetime.now() - timedelta(days=wash_sale.WINDOW_DAYS)).date().isoformat()))
+    result = harvest_engine.analyze_positions(positions, current_prices, LOSS_THRESHOLD, MIN_HARVEST_AMOUNT, recent)
+    candidates = result['candidates']
+    exit_code = EXIT_HARVEST if len(candidates) else EXIT_OK
+
+    # 4a. HEADLESS OUTPUT
+    if not interactive:
+        if output_path:
+            with open(output_path, "w", newline="") as f:
+                stream_report(result['positions'], output_format, f)
+            ui.print(f"[green]Report written to {output_path}[/green]")
+        else:
+            stream_report(result['positions'], output_format, sys.stdout)
+        for label, symbols in (("Fetch failed", quotes['failed']), ("No data", quotes['no_data'])):
+            if symbols:
+                ui.print(f"[yellow]{label}:[/yellow] {', '.join(symbols)}")
+        ui.print(f"{len(candidates)} harvest candidate(s), total ${result['total_harvest_loss']:,.2f}")
+        vault.close()
+        return exit_code
+
+    # 4b. INTERACTIVE RENDER
     console.print("\n[bold]2. Analysis Results[/bold]\n")
+
+    # Candidates first, then the biggest losers - big portfolios only show the top N
+    ranked = result['positions'].assign(
+        _rank=(result['positions']['status'] != harvest_engine.HARVEST)
+    ).sort_values(['_rank', 'gain_loss'], na_position='last')
+    shown = ranked if show_all else ranked.head(top)
     
     table = Table(title="Harvest Opportunities", box=box.SIMPLE_HEAD, show_lines=False)
     table.add_column("Asset", style="bold white")
@@ -115,66 +394,64 @@ def run_tax_scout():
     table.add_column("Current Price", justify="right")
     table.add_column("Gain/Loss", justify="right")
     table.add_column("Status", justify="center")
-    
-    harvest_candidates = []
-    
-    for row in holdings:
-        ticker, qty, total_cost_basis = row
-        
-        if not ticker or ticker == 'UNKNOWN': 
+    if len(shown) < len(ranked):
+        table.caption = f"Showing top {len(shown)} of {len(ranked)} positions. Use --all to see everything."
+
+    status_style = {
+        harvest_engine.HARVEST: "[bold red]HARVEST[/bold red]",
+        harvest_engine.WASH_RISK: "[magenta]Wash Risk[/magenta]",
+        harvest_engine.WATCH: "[yellow]Watch[/yellow]",
+        harvest_engine.HEALTHY: "[green]Healthy[/green]",
+        harvest_engine.HOLD: "[dim]Hold[/dim]",
+    }
+
+    for row in shown.itertuples():
+        if row.status == harvest_engine.NO_DATA:
+            table.add_row(row.Index, "---", "---", "---", "[bold red]⚠️ Data Err[/bold red]")
             continue
 
-        # Derived Average Cost (Price per share)
-        # Handle division by zero just in case
-        avg_cost = total_cost_basis / qty if qty else 0
-            
-        lookup_ticker = f"{ticker}-USD" if ticker in ['BTC', 'ETH'] else ticker
-        live_price = current_prices.get(lookup_ticker)
-        
-        if live_price:
-            market_val = live_price * qty
-            # We use the explicit Total Cost Basis from DB
-            gain_loss_amt = market_val - total_cost_basis
-            
-            # Calculate % change
-            gain_loss_pct = (live_price - avg_cost) / avg_cost if avg_cost > 0 else 0
-            
-            # FORMATTING
-            color = "green" if gain_loss_amt >= 0 else "red"
-            fmt_amt = f"[{color}]${gain_loss_amt:,.2f}[/{color}]"
-            fmt_pct = f"[{color}]{gain_loss_pct*100:+.2f}%[/{color}]"
-            
-            # DECISION LOGIC
-            status = "[dim]Hold[/dim]"
-            
-            if gain_loss_pct <= LOSS_THRESHOLD and gain_loss_amt <= -MIN_HARVEST_AMOUNT:
-                status = "[bold red]HARVEST[/bold red]"
-                harvest_candidates.append((ticker, gain_loss_amt))
-            elif gain_loss_amt < 0:
-                status = "[yellow]Watch[/yellow]"
-            elif gain_loss_amt > 0:
-                status = "[green]Healthy[/green]"
-            
-            table.add_row(
-                ticker,
-                f"${total_cost_basis:,.0f}",
-                f"${live_price:,.2f}",
-                f"{fmt_amt} ({fmt_pct})",
-                status
-            )
-        else:
-            table.add_row(ticker, "---", "---", "---", "[bold red]⚠️ Data Err[/bold red]")
+        # FORMATTING
+        color = "green" if row.gain_loss >= 0 else "red"
+        fmt_amt = f"[{color}]${row.gain_loss:,.2f}[/{color}]"
+        fmt_pct = f"[{color}]{row.gain_loss_pct*100:+.2f}%[/{color}]"
 
-    console.print(Align.center(table))
+        table.add_row(
+            row.Index,
+            f"${row.cost_basis:,.0f}",
+            f"${row.price:,.2f}",
+            f"{fmt_amt} ({fmt_pct})",
+            status_style[row.status]
+        )
+
+    if show_all and len(shown) > top:
+        with console.pager(styles=True):
+            console.print(Align.center(table))
+    else:
+        console.print(Align.center(table))
+
+    if quotes['failed']:
+        console.print(f"[bold red]⚠️ Could not reach Yahoo for:[/bold red] {', '.join(quotes['failed'])} [dim](retry later)[/dim]")
+    if quotes['no_data']:
+        console.print(f"[yellow]No market data for:[/yellow] {', '.join(quotes['no_data'])} [dim](check the symbol)[/dim]")
+    held_back = result['positions']['disallowed_loss'].sum()
+    if held_back:
+        console.print(f"[magenta]Wash-sale check:[/magenta] ${held_back:,.2f} of losses held back (bought within the last {wash_sale.WINDOW_DAYS} days)")
     
-    # 4. ACTION REPORT
-    if harvest_candidates:
-        total_potential_loss = sum([x[1] for x in harvest_candidates])
-        
+    # 5. ACTION REPORT
+    if len(candidates):
+        recommendation = "[italic]Recommendation: Review these positions for replacement.[/italic]"
+        if proxies:
+            # Imported here so a plain scout run never needs an OpenAI key
+            from spokes.proxy_finder import get_proxy_suggestions
+            with console.status("[cyan]Finding replacement proxies...[/cyan]"):
+                suggestions = get_proxy_suggestions(list(candidates.index), vault)
+            recommendation = "[bold]Replacement Proxies:[/bold]\n" + "\n".join(
+                f"  {ticker} -> {suggestion}" for ticker, suggestion in suggestions.items()
+            )
         summary_panel = Panel(
-            f"[bold]Detected {len(harvest_candidates)} opportunities.[/bold]\n"
-            f"Total Tax Deduction Available: [bold red]${total_potential_loss:,.2f}[/bold red]\n\n"
-            "[italic]Recommendation: Review these positions for replacement.[/italic]",
+            f"[bold]Detected {len(candidates)} opportunities.[/bold]\n"
+            f"Total Tax Deduction Available: [bold red]${result['total_harvest_loss']:,.2f}[/bold red]\n\n"
+            f"{recommendation}",
             title="[bold red]ACTION REQUIRED[/bold red]",
             border_style="red"
         )
@@ -184,6 +461,21 @@ def run_tax_scout():
         console.print("\n[bold green]✅ Portfolio is efficient. No significant losses to harvest.[/bold green]")
 
     vault.close()
+    return exit_code
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tax Scout - find tax-loss harvesting opportunities.")
+    parser.add_argument("--format", choices=["table", "jsonl", "csv"], default="table",
+                        help="'table' for the interactive view, 'jsonl'/'csv' to stream results (for cron)")
+    parser.add_argument("--output", help="Write the jsonl/csv report to this file instead of stdout")
+    parser.add_argument("--top", type=int, default=TOP_N, help="Rows shown in the interactive view")
+    parser.add_argument("--all", action="store_true", help="Show every position (opens a pager)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Price from Plaid's last close (saved during sync); only fetch stale/missing symbols")
+    parser.add_argument("--proxies", action="store_true",
+                        help="Suggest a replacement proxy for each harvest candidate (uses OpenAI, cached)")
+    args = parser.parse_args(argv)
+    return run_tax_scout(args.format, args.output, args.top, args.all, args.offline, args.proxies)
 
 if __name__ == "__main__":
-    run_tax_scout()
\ No newline at end of file
+    sys.exit(main())
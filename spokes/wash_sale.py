@@ -0,0 +1,163 @@
+"""
+The wash-sale rule, checked locally instead of asked of an LLM.
+
+A loss is (partly) disallowed when the same security is bought within
+30 days before or after the sale - across every account we know about.
+Trades are indexed per ticker (sorted dates + running buy totals), so each
+sell only needs two binary searches: O(n log n) overall, no API calls.
+
+Simplifications (talk to a tax advisor for the real thing):
+  - Cost basis is the running average cost, not specific lots.
+  - 'Substantially identical' means the same ticker.
+  - A replacement buy may be counted against more than one loss sale,
+    so clustered sells are flagged conservatively.
+"""
+
+import argparse
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from core.database import SheilaVault
+
+# --- CONFIGURATION ---
+WINDOW_DAYS = 30      # Days before AND after the sale (61-day window in total)
+LOOKBACK_DAYS = 365   # History checked by the CLI report
+# ---------------------
+
+def _ordinal(day):
+    """'YYYY-MM-DD' (or a date) -> day number, so windows are plain integer ranges."""
+    if isinstance(day, str):
+        day = date.fromisoformat(day[:10])
+    return day.toordinal()
+
+def index_trades(trades):
+    """
+    trades: iterable of (ticker, date, quantity, price, account_id) rows, quantity > 0 for
+    buys and < 0 for sells (SheilaVault.get_trades() returns exactly this).
+    Returns {ticker: {'trades': [(day, quantity, price, account_id)] oldest first,
+                      'buy_days': [day, ...], 'buy_totals': [running bought quantity, ...]}}
+    """
+    index = {}
+    for ticker, day, quantity, price, account_id in trades:
+        if quantity:
+            index.setdefault(ticker, {'trades': []})['trades'].append((_ordinal(day), quantity, price or 0.0, account_id))
+
+    for entry in index.values():
+        entry['trades'].sort(key=lambda t: t[0])
+        buy_days, buy_totals, total = [], [], 0.0
+        for day, quantity, _, _ in entry['trades']:
+            if quantity > 0:
+                total += quantity
+                buy_days.append(day)
+                buy_totals.append(total)
+        entry['buy_days'] = buy_days
+        entry['buy_totals'] = buy_totals
+    return index
+
+def _bought_between(entry, first_day, last_day):
+    """Quantity bought from first_day to last_day (inclusive) - two binary searches."""
+    days, totals = entry['buy_days'], entry['buy_totals']
+    lo = bisect_left(days, first_day)
+    hi = bisect_right(days, last_day)
+    if hi <= lo:
+        return 0.0
+    return totals[hi - 1] - (totals[lo - 1] if lo else 0.0)
+
+def find_wash_sales(trades, window_days=WINDOW_DAYS):
+    """
+    Walks every ticker's trades in date order and checks each sell at a loss
+    for replacement buys inside +/- window_days.
+
+    Returns one dict per loss sale, oldest first:
+      ticker, date, account_id, quantity, realized (negative), replacement_qty,
+      disallowed (the part of 'realized' that doesn't count), allowed
+    """
+    index = trades if isinstance(trades, dict) else index_trades(trades)
+    results = []
+
+    for ticker, entry in index.items():
+        held, cost = 0.0, 0.0
+        for day, quantity, price, account_id in entry['trades']:
+            if quantity > 0:
+                held += quantity
+                cost += quantity * price
+                continue
+
+            sold = -quantity
+            if held <= 0: # No buys on record (bought before our history starts) - basis unknown
+                continue
+            avg_cost = cost / held
+            matched = min(sold, held)
+            realized = matched * (price - avg_cost)
+            held -= matched
+            cost -= matched * avg_cost
+            if realized >= 0:
+                continue
+
+            # Buys after the sale always count. Buys before it only count if
+            # those shares are still held afterwards (selling them too is fine).
+            after = _bought_between(entry, day + 1, day + window_days)
+            before = min(_bought_between(entry, day - window_days, day), held)
+            replacement = min(matched, after + before)
+            disallowed = realized * replacement / matched
+
+            results.append({
+                'ticker': ticker,
+                'date': date.fromordinal(day).isoformat(),
+                'account_id': account_id,
+                'quantity': matched,
+                'realized': realized,
+                'replacement_qty': replacement,
+                'disallowed': disallowed,
+                'allowed': realized - disallowed,
+            })
+
+    results.sort(key=lambda r: (r['date'], r['ticker']))
+    return results
+
+def recent_buys(trades, as_of=None, window_days=WINDOW_DAYS):
+    """
+    {ticker: quantity bought in the last window_days} - shares that could turn a
+    loss sale today into a wash sale. Used by tax_scout to hold back at-risk losses.
+    """
+    index = trades if isinstance(trades, dict) else index_trades(trades)
+    today = _ordinal(as_of or date.today())
+    bought = {}
+    for ticker, entry in index.items():
+        quantity = _bought_between(entry, today - window_days, today)
+        if quantity > 0:
+            bought[ticker] = quantity
+    return bought
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Wash-Sale Check - flags disallowed losses in your trade history.")
+    parser.add_argument("--days", type=int, default=LOOKBACK_DAYS, help="How much history to check")
+    args = parser.parse_args(argv)
+
+    vault = SheilaVault()
+    since = (date.today() - timedelta(days=args.days + WINDOW_DAYS)).isoformat()
+    trades = vault.get_trades(since)
+    vault.close()
+
+    start = time.perf_counter()
+    index = index_trades(trades)
+    sales = find_wash_sales(index)
+    at_risk = recent_buys(index)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    cutoff = (date.today() - timedelta(days=args.days)).isoformat()
+    washes = [s for s in sales if s['disallowed'] < 0 and s['date'] >= cutoff]
+    print(f"S.H.E.I.L.A. | Checked {len(trades)} trades across {len(index)} securities in {elapsed:.1f}ms")
+    for s in washes:
+        print(f"   WASH {s['date']} {s['ticker']:<8} sold {s['quantity']:g} | loss ${s['realized']:,.2f}, "
+              f"disallowed ${s['disallowed']:,.2f} ({s['replacement_qty']:g} replacement shares)")
+    if not washes:
+        print("   No wash sales found.")
+    if at_risk:
+        print("   Bought in the last 30 days (a loss sale now may be a wash): "
+              + ", ".join(f"{t} ({q:g})" for t, q in sorted(at_risk.items())))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())